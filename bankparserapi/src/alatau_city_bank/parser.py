@@ -36,31 +36,73 @@ TARGET_COLS_RU = [
     "Счет",
 ]
 
+_WS_RE = re.compile(r"\s+")
+_COLON_DATE_RE = re.compile(r"(\b\d{2}):(\d{2}):(\d{4}\b)")
+_FLOAT_CLEAN_RE = re.compile(r"[^0-9.\-]")
+# amounts: drop (no-break) spaces and read "," as the decimal point, in one pass
+_FLOAT_TRANS = str.maketrans({"\xa0": None, "\u202f": None, " ": None, ",": "."})
+_DATE_TIME_RE = re.compile(r"\b(\d{2}\.\d{2}\.\d{4})\s+(\d{2}:\d{2}(?::\d{2})?)\b")
+# после _norm_col ячейки обрезаны, так что заголовок/футер — точные строки
+_TX_HEADER_CELL = "Дата операции"
+_FOOTER_CELLS = ("ИТОГО", "ИТОГО:")
+_SPACE_DROP = str.maketrans("", "", " ")
+
+# header (1-я страница)
+_HDR_HSPACE_RE = re.compile(r"[ \t]+")
+_HDR_ACCOUNT_RE = re.compile(r"Лицевой\s+счет:?[\s№]*([A-Z0-9]+)\s*([A-Z]{3})", re.I)
+_HDR_CLIENT_RE = re.compile(r"Клиент:\s*(.+?)\s+ИИН\s*\(БИН\):", re.S)
+_HDR_IIN_RE = re.compile(r"ИИН\s*\(БИН\):\s*([0-9]{10,12})")
+_HDR_CREDIT_RE = re.compile(r"Обороты\s+по\s+кредиту:\s*([0-9\s,]+)")
+_HDR_DEBIT_RE = re.compile(r"Обороты\s+по\s+дебету:\s*([0-9\s,]+)")
+_HDR_OPEN_BAL_RE = re.compile(
+    r"Входящий\s+остаток:\s*([0-9\s,]+)\s*Дата\s+остатка:\s*(\d{2}\.\d{2}\.\d{4})"
+)
+_HDR_CLOSE_BAL_RE = re.compile(
+    r"Исходящий\s+остаток:\s*([0-9\s,]+)\s*Дата\s+остатка:\s*(\d{2}\.\d{2}\.\d{4})"
+)
+_HDR_EQUIV_RE = re.compile(r"Эквивалент\s+в\s+тенге\s+по\s+курсу\s+НБ\s+РК:\s*([0-9\s,]*)")
+_DIGIT_RE = re.compile(r"\d")
+
 
 # ---------- HELPERS ----------
 
-def _norm_cell(x: object) -> str:
-    s = "" if pd.isna(x) else str(x)
-    s = s.replace("\xa0", " ").replace("\u202f", " ")
-    s = re.sub(r"\s+", " ", s.strip())  # collapse newlines & spaces
+def _norm_col(col: pd.Series) -> pd.Series:
+    """Column-wise cell normalization: missing -> "", collapsed whitespace, dotted dates."""
+    s = col.fillna("").astype(str)
+    # \s also covers \xa0 / \u202f, so one pass collapses newlines & (no-break) spaces
+    s = s.str.replace(_WS_RE, " ", regex=True).str.strip()
     # fix colon-dates like 30:09:2024 -> 30.09.2024
-    s = re.sub(r"(\b\d{2}):(\d{2}):(\d{4}\b)", r"\1.\2.\3", s)
-    return s
+    return s.str.replace(_COLON_DATE_RE, r"\1.\2.\3", regex=True)
 
 
 def _to_float_ru(s: str):
     if pd.isna(s):
         return np.nan
-    s = str(s)
-    s = s.replace("\xa0", " ").replace("\u202f", " ").replace(" ", "")
-    s = s.replace(",", ".")
-    s = re.sub(r"[^0-9.\-]", "", s)
+    s = str(s).translate(_FLOAT_TRANS)
     if s in ("", "."):
         return np.nan
     try:
         return float(s)
-    except Exception:
+    except ValueError:
+        pass
+    # slow path: stray text around the number ("1 000,00 KZT", newlines, ...)
+    s = _FLOAT_CLEAN_RE.sub("", s)
+    if s in ("", "."):
         return np.nan
+    try:
+        return float(s)
+    except ValueError:
+        return np.nan
+
+
+def _to_float_ru_col(col: pd.Series) -> pd.Series:
+    """Vectorized _to_float_ru: to_numeric on the translated strings, per-cell fallback for the rest."""
+    text = col.astype(str).str.translate(_FLOAT_TRANS)
+    out = pd.to_numeric(text, errors="coerce").astype(float)
+    retry = out.isna() & col.notna() & ~text.isin(("", "."))
+    if retry.any():
+        out[retry] = text[retry].map(_to_float_ru)
+    return out
 
 
 # ---------- HEADER PARSING (через PyMuPDF) ----------
@@ -72,7 +114,7 @@ def _parse_acb_header_from_text(text: str) -> pd.DataFrame:
     """
     # нормализуем пробелы/переносы
     t = text.replace("\xa0", " ").replace("\u202f", " ")
-    t = re.sub(r"[ \t]+", " ", t)
+    t = _HDR_HSPACE_RE.sub(" ", t)
 
     meta = {
         "account": None,
@@ -91,104 +133,121 @@ def _parse_acb_header_from_text(text: str) -> pd.DataFrame:
     }
 
     # ----- Лицевой счёт + валюта -----
-    m = re.search(
-        r"Лицевой\s+счет:?[\s№]*([A-Z0-9]+)\s*([A-Z]{3})",
-        t,
-        flags=re.I,
-    )
+    m = _HDR_ACCOUNT_RE.search(t)
     if m:
         meta["account"] = m.group(1)
         meta["currency"] = m.group(2).upper()
 
     # ----- Клиент (может быть на 2 строках) -----
     # "Клиент: Индивидуальный\nпредприниматель "ОРИОН"\nИИН (БИН): ..."
-    m = re.search(r"Клиент:\s*(.+?)\s+ИИН\s*\(БИН\):", t, flags=re.S)
+    m = _HDR_CLIENT_RE.search(t)
     if m:
-        client = re.sub(r"\s+", " ", m.group(1)).strip()
+        client = _WS_RE.sub(" ", m.group(1)).strip()
         meta["client"] = client
 
     # ----- ИИН / БИН -----
-    m = re.search(r"ИИН\s*\(БИН\):\s*([0-9]{10,12})", t)
+    m = _HDR_IIN_RE.search(t)
     if m:
         meta["iin_bin"] = m.group(1)
 
     # ----- Обороты по кредиту/дебету -----
-    m = re.search(r"Обороты\s+по\s+кредиту:\s*([0-9\s,]+)", t)
+    m = _HDR_CREDIT_RE.search(t)
     if m:
         meta["credit_turnover"] = _to_float_ru(m.group(1))
 
-    m = re.search(r"Обороты\s+по\s+дебету:\s*([0-9\s,]+)", t)
+    m = _HDR_DEBIT_RE.search(t)
     if m:
         meta["debit_turnover"] = _to_float_ru(m.group(1))
 
     # ----- Входящий остаток + дата -----
-    m = re.search(
-        r"Входящий\s+остаток:\s*([0-9\s,]+)\s*Дата\s+остатка:\s*(\d{2}\.\d{2}\.\d{4})",
-        t,
-    )
+    m = _HDR_OPEN_BAL_RE.search(t)
     if m:
         meta["opening_balance"] = _to_float_ru(m.group(1))
         meta["opening_balance_date"] = m.group(2)
 
     # ----- Исходящий остаток + дата -----
-    m = re.search(
-        r"Исходящий\s+остаток:\s*([0-9\s,]+)\s*Дата\s+остатка:\s*(\d{2}\.\d{2}\.\d{4})",
-        t,
-    )
+    m = _HDR_CLOSE_BAL_RE.search(t)
     if m:
         meta["closing_balance"] = _to_float_ru(m.group(1))
         meta["closing_balance_date"] = m.group(2)
 
     # ----- Эквивалент в тенге по курсу НБ РК (2 строки) -----
-    eq_matches = list(
-        re.finditer(
-            r"Эквивалент\s+в\s+тенге\s+по\s+курсу\s+НБ\s+РК:\s*([0-9\s,]*)",
-            t,
-        )
-    )
+    eq_matches = list(_HDR_EQUIV_RE.finditer(t))
     if len(eq_matches) >= 1:
         s1 = eq_matches[0].group(1).strip()
-        if re.search(r"\d", s1):
+        if _DIGIT_RE.search(s1):
             meta["opening_balance_equiv_kzt_nb"] = _to_float_ru(s1)
 
     if len(eq_matches) >= 2:
         s2 = eq_matches[1].group(1).strip()
-        if re.search(r"\d", s2):
+        if _DIGIT_RE.search(s2):
             meta["closing_balance_equiv_kzt_nb"] = _to_float_ru(s2)
 
     return pd.DataFrame([meta])
 
 
-def _parse_acb_header_text(pdf_path: str) -> pd.DataFrame:
+def _empty_acb_header() -> pd.DataFrame:
+    cols = [
+        "account",
+        "currency",
+        "client",
+        "iin_bin",
+        "credit_turnover",
+        "debit_turnover",
+        "opening_balance",
+        "opening_balance_date",
+        "opening_balance_equiv_kzt_nb",
+        "closing_balance",
+        "closing_balance_date",
+        "closing_balance_equiv_kzt_nb",
+        "raw_header_text",
+    ]
+    return pd.DataFrame([{c: None for c in cols}])
+
+
+def _read_acb_pdf_with_fitz(
+    pdf_path: str,
+) -> tuple[str | None, list[pd.DataFrame], int | None]:
     """
-    Достаёт текст 1-й страницы через PyMuPDF и передаёт в парсер выше.
-    Если pymupdf не установлен — возвращает одну строку с None.
+    Один проход PyMuPDF:
+    - текст 1-й страницы (для реквизитов);
+    - таблицы всех страниц через page.find_tables() (по линиям, как Camelot
+      lattice) — сырые строки, включая строки-заголовки, как у Camelot t.df;
+      если find_tables не сработал — [];
+    - номер (с 1) первой страницы с текстом 'Дата операции' — с неё Camelot
+      начинает, если до него дойдёт; None — маркер не найден.
+    Если pymupdf не установлен — (None, [], None).
     """
     try:
         import fitz  # pymupdf
     except ImportError:
-        cols = [
-            "account",
-            "currency",
-            "client",
-            "iin_bin",
-            "credit_turnover",
-            "debit_turnover",
-            "opening_balance",
-            "opening_balance_date",
-            "opening_balance_equiv_kzt_nb",
-            "closing_balance",
-            "closing_balance_date",
-            "closing_balance_equiv_kzt_nb",
-            "raw_header_text",
-        ]
-        return pd.DataFrame([{c: None for c in cols}])
+        return None, [], None
 
+    frames: list[pd.DataFrame] | None = []
+    first_tx_page = None
     with fitz.open(pdf_path) as doc:
-        page0 = doc[0]
-        text = page0.get_text("text")
-
-    return _parse_acb_header_from_text(text)
+        text = doc[0].get_text("text")
+        for page_no, page in enumerate(doc, start=1):
+            if first_tx_page is None:
+                page_text = text if page_no == 1 else page.get_text("text")
+                if _TX_HEADER_CELL in _WS_RE.sub(" ", page_text):
+                    first_tx_page = page_no
+            if frames is None:
+                continue
+            try:
+                frames.extend(pd.DataFrame(t.extract()) for t in page.find_tables().tables)
+            except Exception:
+                frames = None
+
+    return text, frames or [], first_tx_page
+
+
+def _first_tx_header_idx(raw: pd.DataFrame) -> int | None:
+    """Индекс первой строки 'Дата операции' (начало блока транзакций) или None."""
+    hdr_rows = raw.index[
+        raw.iloc[:, 0].eq(_TX_HEADER_CELL)
+    ]
+    return int(hdr_rows[0]) if len(hdr_rows) else None
 
 
 def _parse_acb_footer_from_tx(tx: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
@@ -198,7 +257,7 @@ def _parse_acb_footer_from_tx(tx: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFr
     - tx_no_footer: tx без строки ИТОГО
     """
     # ищем строку футера
-    mask_footer = tx["Дата операции"].str.match(r"^ИТОГО:?\s*$", na=False)
+    mask_footer = tx["Дата операции"].isin(_FOOTER_CELLS)
     footer_rows = tx[mask_footer].copy()
 
     footer_meta = {
@@ -226,58 +285,69 @@ def parse_acb_pdf_with_camelot(pdf_path: str):
     """
     Parse an Alatau City Bank PDF statement into header / tx / footer DataFrames.
     """
-    # 0) Сначала парсим реквизиты из текста
-    header_df = _parse_acb_header_text(pdf_path)
-
-    # 1) Читаем все таблицы Camelot'ом
-    tables = camelot.read_pdf(pdf_path, pages="1-end", flavor="lattice")
-    if len(tables) == 0:
-        raise RuntimeError(
-            "Camelot не нашёл ни одной таблицы. Проверь Ghostscript/страницы."
-        )
-
-    raw = pd.concat([t.df for t in tables], ignore_index=True)
-
-    # 2) Нормализуем ячейки (без applymap FutureWarning)
-    raw = raw.apply(lambda col: col.map(_norm_cell))
-
-    # 3) Ищем первую строку 'Дата операции' — это начало блока транзакций
-    hdr_rows = raw.index[
-        raw.iloc[:, 0].str.fullmatch(r"Дата операции", na=False)
-    ].tolist()
-    if not hdr_rows:
-        raise RuntimeError(
-            "Не найден заголовок 'Дата операции'. Проверь раскладку/страницы."
-        )
-    first_hdr_idx = hdr_rows[0]
-
-    tx = raw.iloc[first_hdr_idx:].copy()
-
-    # 4) Приводим к 13 колонкам и задаём TARGET_COLS_RU
-    tx = tx.reindex(columns=list(range(max(13, tx.shape[1]))))
-    tx = tx.iloc[:, :13].copy()
+    # 0) Один раз открываем PDF в PyMuPDF: реквизиты из текста + таблицы
+    header_text, fitz_frames, first_tx_page = _read_acb_pdf_with_fitz(pdf_path)
+    if header_text is None:
+        header_df = _empty_acb_header()
+    else:
+        header_df = _parse_acb_header_from_text(header_text)
+
+    # 1-3) Таблицы PyMuPDF → нормализация → первая строка 'Дата операции'
+    #      (нормализация ячеек — векторные .str-операции по колонкам)
+    first_hdr_idx = None
+    if fitz_frames:
+        raw = pd.concat(fitz_frames, ignore_index=True).apply(_norm_col)
+        # ровно 13 колонок: меньше — PyMuPDF склеил столбцы, больше — разбил
+        # ячейки; обрезка сдвинула бы значения по колонкам, такой разбор не берём
+        if raw.shape[1] == len(TARGET_COLS_RU):
+            first_hdr_idx = _first_tx_header_idx(raw)
+
+    # Camelot (Ghostscript) — только если PyMuPDF не нашёл таблицу транзакций;
+    # страницы до первой с 'Дата операции' (обложка/реквизиты) не разбираем
+    if first_hdr_idx is None:
+        pages = f"{first_tx_page}-end" if first_tx_page else "1-end"
+        tables = camelot.read_pdf(pdf_path, pages=pages, flavor="lattice")
+        if len(tables) == 0:
+            raise RuntimeError(
+                "Camelot не нашёл ни одной таблицы. Проверь Ghostscript/страницы."
+            )
+
+        # генератор: список ссылок на все таблицы Camelot не держим
+        raw = pd.concat((t.df for t in tables), ignore_index=True)
+        raw = raw.apply(_norm_col)
+
+        first_hdr_idx = _first_tx_header_idx(raw)
+        if first_hdr_idx is None:
+            raise RuntimeError(
+                "Не найден заголовок 'Дата операции'. Проверь раскладку/страницы."
+            )
+
+    # 4) Блок транзакций, ровно 13 колонок (лишние отрезаем, недостающие — NaN)
+    #    и TARGET_COLS_RU; reindex возвращает новый фрейм — одна копия вместо трёх.
+    #    Колонки raw — 0..n-1 (у каждой таблицы RangeIndex), так что метки = позиции.
+    n_cols = len(TARGET_COLS_RU)
+    tx = raw.iloc[first_hdr_idx:, :n_cols].reindex(columns=range(n_cols))
     tx.columns = TARGET_COLS_RU
 
     # 5) Вытащим футер ИТОГО и уберём его из tx
     footer_df, tx = _parse_acb_footer_from_tx(tx)
 
     # 6) Убираем повторяющиеся заголовки внутри таблицы
-    mask_is_header = tx["Дата операции"].str.fullmatch("Дата операции", na=False)
-    tx = tx[~mask_is_header].copy()
+    tx = tx[~tx["Дата операции"].eq(_TX_HEADER_CELL)].copy()
 
     # 7) Склеиваем дату и время в "Дата операции", если они развалились
     tx["Дата операции"] = tx["Дата операции"].str.replace(
-        r"\b(\d{2}\.\d{2}\.\d{4})\s+(\d{2}:\d{2}(?::\d{2})?)\b",
-        r"\1 \2",
-        regex=True,
+        _DATE_TIME_RE, r"\1 \2", regex=True
     )
 
     # 8) Числовые колонки → float
     for col in ["Дебет", "Кредит", "Курс НБ РК", "Эквивалент в тенге по курсу НБ РК"]:
-        tx[col] = tx[col].apply(_to_float_ru)
+        tx[col] = _to_float_ru_col(tx[col])
 
-    # 9) Текстовые колонки — trim + чистка nan
-    for col in [
+    # 9) Текстовые колонки — чистка nan одним проходом по всем колонкам
+    #    (ячейки уже обрезаны _norm_col; NaN бывает только в колонках,
+    #    добавленных reindex, — их заполняем "" до astype)
+    text_cols = [
         "№ док",
         "КНП",
         "Назначение платежа",
@@ -287,13 +357,12 @@ def parse_acb_pdf_with_camelot(pdf_path: str):
         "Счет",
         "Дата отражения по счету",
         "Дата операции",
-    ]:
-        tx[col] = (
-            tx[col].astype(str).str.strip().replace({"nan": "", "NaN": ""})
-        )
+    ]
+    text = tx[text_cols].fillna("").astype(str)
+    tx[text_cols] = text.mask(text.isin(("nan", "NaN")), "")
 
-    tx["БИК корр."] = tx["БИК корр."].str.upper().str.replace(" ", "", regex=False)
-    tx["Счет"] = tx["Счет"].str.upper().str.replace(" ", "", regex=False)
+    tx["БИК корр."] = tx["БИК корр."].str.translate(_SPACE_DROP).str.upper()
+    tx["Счет"] = tx["Счет"].str.translate(_SPACE_DROP).str.upper()
 
     # 10) Удаляем полностью пустые строки по ключевым колонкам
     key_subset = [
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from pathlib import Path
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean
+from sqlalchemy import create_engine, event, func, Column, Integer, String, DateTime, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from passlib.context import CryptContext
@@ -37,6 +37,24 @@ engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False}
 )
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    """
+    WAL lets readers run while a write commits; with synchronous=NORMAL the
+    database stays consistent after a crash and fsyncs only at checkpoints
+    (a power loss can drop the last commits, which auth can live with).
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -54,11 +72,18 @@ pwd_context = CryptContext(
     deprecated="auto",
 )
 
+# passlib picks and self-tests the bcrypt backend on first use; do it at import
+# so the first login request does not pay for it.
+pwd_context.handler("bcrypt").get_backend()
+
+_SHA256 = hashlib.sha256
+
+
 def _prehash_password(password: str) -> bytes:
     """
     SHA-256 pre-hash to avoid bcrypt 72-byte limit
     """
-    return hashlib.sha256(password.encode("utf-8")).digest()
+    return _SHA256(password.encode("utf-8")).digest()
 
 
 def get_password_hash(password: str) -> str:
@@ -107,11 +132,15 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=True)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Timestamps come from SQLite's CURRENT_TIMESTAMP (UTC, like utcnow).
+    # default=/onupdate= inline it into the INSERT/UPDATE, so users.db files
+    # created without the server_default still get filled.
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     updated_at = Column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now()
     )
 
 
@@ -18,14 +18,24 @@ For each PDF:
       <stem>_meta.csv
       <stem>_tx_ip_enriched.csv
       <stem>_ip_income_monthly.csv
+    (--format parquet|both: transactions / tx_ip_enriched / ip_income_monthly
+     also or instead as .parquet)
 """
 
 import argparse
+import importlib.util
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
 
 import pandas as pd
-import pikepdf  # <— needed to open PDFs for metadata dump
 
 from src.utils import warnings_setup  # noqa: F401  # side-effect: filters warnings
 
@@ -39,8 +49,91 @@ from src.utils.statement_validation import (
 from src.utils.convert_pdf_json_pages import dump_pdf_pages
 from src.utils.convert_pdf_json_page import dump_catalog, dump_pages
 
+# схема числовой валидации BCC – реестр статический, берём один раз при импорте
+_BCC_SCHEMA = BANK_SCHEMAS.get("BCC")
+
+
+def _dumps_debug(obj: dict) -> str:
+    """debug_info → JSON string; orjson when available (numpy scalars, non-str keys)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _dumps_meta(obj: dict, pretty: bool = False) -> str:
+    """
+    PDF meta JSON → string. Compact by default (the file is only read back by
+    validate_pdf_metadata_from_json); pretty=True keeps the old indent=2 layout.
+    """
+    if orjson is not None:
+        opt = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            return orjson.dumps(obj, option=opt).decode("utf-8")
+        except TypeError:
+            pass
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _pdf_stamp(pdf_path: Path) -> str:
+    st = pdf_path.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
 
-def ensure_pdf_meta_json(pdf_path: Path, meta_dir: Path) -> Path:
+def _is_fresh(out_path: Path, pdf_path: Path) -> bool:
+    """
+    out_path is up to date for pdf_path: exists and its sidecar <out>.stamp
+    matches the PDF size+mtime. The stamp is written only after a dump
+    completes, so an output without one (crashed/partial dump) is stale.
+    """
+    stamp_path = out_path.with_name(out_path.name + ".stamp")
+    if not (out_path.exists() and stamp_path.exists()):
+        return False
+    return stamp_path.read_text(encoding="utf-8").strip() == _pdf_stamp(pdf_path)
+
+
+def _write_stamp(out_path: Path, pdf_path: Path) -> None:
+    out_path.with_name(out_path.name + ".stamp").write_text(
+        _pdf_stamp(pdf_path), encoding="utf-8"
+    )
+
+
+def _save_table(
+    df: pd.DataFrame,
+    out_dir: Path,
+    name: str,
+    fmt: str = "csv",
+    errors: Optional[dict] = None,
+) -> Optional[Path]:
+    """
+    Save df as <out_dir>/<name>.csv and/or .parquet (fmt: csv | parquet | both).
+    CSV goes first; a Parquet failure (e.g. ArrowTypeError on a mixed str/float
+    object column) does not abort the PDF – it is recorded in errors[name].
+    Returns the CSV path when one is written, else the Parquet path (None if
+    the Parquet write failed).
+    """
+    csv_path = out_dir / f"{name}.csv"
+    pq_path = out_dir / f"{name}.parquet"
+    if fmt in ("csv", "both"):
+        df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+    if fmt in ("parquet", "both"):
+        try:
+            df.to_parquet(pq_path, index=False, compression="zstd")
+        except Exception as e:
+            if errors is not None:
+                errors[name] = f"{type(e).__name__}: {e}"
+            if fmt == "parquet":
+                return None
+    return csv_path if fmt in ("csv", "both") else pq_path
+
+
+def ensure_pdf_meta_json(pdf_path: Path, meta_dir: Path, pretty: bool = False) -> Path:
     """
     Ensure a single JSON with PDF metadata+pages exists for this PDF.
 
@@ -55,16 +148,21 @@ def ensure_pdf_meta_json(pdf_path: Path, meta_dir: Path) -> Path:
       "Pages": [...],
       "XRef": [...]   # (we skip this part here)
     }
+    Written compact; pretty=True indents it for reading by hand.
     """
     from src.utils.path_security import sanitize_filename, validate_path_for_write
     meta_dir.mkdir(parents=True, exist_ok=True)
     safe_stem = sanitize_filename(pdf_path.stem)
     json_path = meta_dir / f"{safe_stem}.json"
-    if json_path.exists():
+    if _is_fresh(json_path, pdf_path):
         return json_path
 
     print(f"[meta-json] Creating {json_path.name} from {pdf_path.name}")
 
+    # pikepdf грузим лениво: нужен только при создании meta JSON,
+    # воркеры пула с готовым кэшем его не импортируют
+    import pikepdf
+
     # replicate convert_pdf_json_page.main() logic
     with pikepdf.open(str(pdf_path)) as pdf:
         kw = dict(
@@ -82,7 +180,8 @@ def ensure_pdf_meta_json(pdf_path: Path, meta_dir: Path) -> Path:
 
     validated = validate_path_for_write(json_path, meta_dir)
     with open(validated, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
+        f.write(_dumps_meta(out, pretty=pretty))
+    _write_stamp(json_path, pdf_path)
 
     return json_path
 
@@ -91,15 +190,16 @@ def ensure_jsonl_for_pdf(
     pdf_path: Path,
     jsonl_dir: Path,
     jsonl_suffix: str = "_pages.jsonl",
+    page_workers: Optional[int] = 1,
 ) -> Path:
     """
     Ensure we have a pdfplumber-style pages JSONL for this PDF in jsonl_dir.
-    If missing, create it with dump_pdf_pages().
+    If missing, create it with dump_pdf_pages() (page_workers is passed through).
     """
     jsonl_dir.mkdir(parents=True, exist_ok=True)
     out_path = jsonl_dir / f"{pdf_path.stem}{jsonl_suffix}"
 
-    if out_path.exists():
+    if _is_fresh(out_path, pdf_path):
         return out_path
 
     print(f"[jsonl] Creating {out_path.name} from {pdf_path.name}")
@@ -108,7 +208,9 @@ def ensure_jsonl_for_pdf(
         out_path=out_path,
         stream_preview_len=4000,
         include_full_stream=False,
+        page_workers=page_workers,
     )
+    _write_stamp(out_path, pdf_path)
     return out_path
 
 
@@ -120,6 +222,9 @@ def process_one_bcc(
     jsonl_suffix: str = "_pages.jsonl",
     months_back: int | None = 12,
     verbose: bool = True,
+    page_workers: Optional[int] = 1,
+    pretty_meta_json: bool = False,
+    out_format: str = "csv",
 ) -> None:
     """
     Обработка одного BCC-выписки:
@@ -128,12 +233,30 @@ def process_one_bcc(
       - парсим header / tx / footer
       - валидируем числовые суммы и PDF metadata
       - считаем доход ИП
-      - сохраняем CSV.
+      - сохраняем CSV (крупные таблицы – по out_format: csv / parquet / both).
     """
     print(f"\n=== Processing BCC: {pdf_path.name} ===")
 
-    # 1) ensure JSONL exists
-    jsonl_path = ensure_jsonl_for_pdf(pdf_path, jsonl_dir, jsonl_suffix=jsonl_suffix)
+    # 1) ensure JSONL + metadata JSON exist — два независимых прохода по PDF
+    #    (pdfplumber / pikepdf), поэтому запускаем их параллельно.
+    #    Пул процессов для страниц (page_workers != 1, None = CPU count) нельзя
+    #    форкать из многопоточного процесса (возможен deadlock) – тогда по очереди.
+    if page_workers != 1:
+        jsonl_path = ensure_jsonl_for_pdf(
+            pdf_path, jsonl_dir, jsonl_suffix=jsonl_suffix, page_workers=page_workers
+        )
+        meta_json_path = ensure_pdf_meta_json(pdf_path, pdf_meta_dir, pretty=pretty_meta_json)
+    else:
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            jsonl_fut = ex.submit(
+                ensure_jsonl_for_pdf,
+                pdf_path, jsonl_dir, jsonl_suffix=jsonl_suffix, page_workers=1,
+            )
+            meta_fut = ex.submit(
+                ensure_pdf_meta_json, pdf_path, pdf_meta_dir, pretty=pretty_meta_json
+            )
+            jsonl_path = jsonl_fut.result()
+            meta_json_path = meta_fut.result()
 
     # 2) parse statement
     header_df, tx_df, footer_df = parse_bcc_statement(str(pdf_path), str(jsonl_path))
@@ -154,7 +277,7 @@ def process_one_bcc(
     num_flags: list[str] = []
     num_debug: dict[str, object] = {}
 
-    schema = BANK_SCHEMAS.get("BCC")
+    schema = _BCC_SCHEMA
     if schema is not None:
         num_flags, num_debug = validate_statement_generic(
             header_df,
@@ -171,7 +294,6 @@ def process_one_bcc(
     pdf_flags: list[str] = []
     pdf_debug: dict[str, object] = {}
 
-    meta_json_path = ensure_pdf_meta_json(pdf_path, pdf_meta_dir)
     try:
         # Security: Validate path before opening
         from src.utils.path_security import validate_path
@@ -206,9 +328,25 @@ def process_one_bcc(
         max_examples=5,
     )
 
-    # 7) meta row
+    # 7) save outputs: the row-heavy tables per out_format (Parquet errors are
+    #    collected for the meta row), 1-row frames always as CSV
+    stem = pdf_path.stem
+    write_errors: dict[str, str] = {}
+
+    tx_path = _save_table(tx_df, out_dir, f"{stem}_transactions", out_format, write_errors)
+    enriched_path = _save_table(
+        enriched_tx, out_dir, f"{stem}_tx_ip_enriched", out_format, write_errors
+    )
+    monthly_path = _save_table(
+        monthly_income, out_dir, f"{stem}_ip_income_monthly", out_format, write_errors
+    )
+
+    # 8) meta row
     all_flags = num_flags + pdf_flags
     all_debug = {"numeric": num_debug, "pdf_meta": pdf_debug}
+    if write_errors:
+        all_flags.append("parquet_write_error")
+        all_debug["parquet_write"] = write_errors
 
     meta_df = pd.DataFrame(
         [{
@@ -216,26 +354,17 @@ def process_one_bcc(
             "pdf_file": pdf_path.name,
             "jsonl_file": jsonl_path.name,
             "flags": ";".join(all_flags),
-            "debug_info": json.dumps(all_debug, ensure_ascii=False),
+            "debug_info": _dumps_debug(all_debug),
         }]
     )
 
-    # 8) save CSVs
-    stem = pdf_path.stem
-
     header_path = out_dir / f"{stem}_header.csv"
-    tx_path = out_dir / f"{stem}_transactions.csv"
     footer_path = out_dir / f"{stem}_footer.csv"
     meta_path = out_dir / f"{stem}_meta.csv"
-    enriched_path = out_dir / f"{stem}_tx_ip_enriched.csv"
-    monthly_path = out_dir / f"{stem}_ip_income_monthly.csv"
 
     header_df.to_csv(header_path, index=False, encoding="utf-8-sig")
-    tx_df.to_csv(tx_path, index=False, encoding="utf-8-sig")
     footer_df.to_csv(footer_path, index=False, encoding="utf-8-sig")
     meta_df.to_csv(meta_path, index=False, encoding="utf-8-sig")
-    enriched_tx.to_csv(enriched_path, index=False, encoding="utf-8-sig")
-    monthly_income.to_csv(monthly_path, index=False, encoding="utf-8-sig")
     income_summary_path = out_dir / f"{stem}_income_summary.csv"
     income_summary_df = pd.DataFrame([income_summary])
     income_summary_df.to_csv(
@@ -253,6 +382,22 @@ def process_one_bcc(
     print(f"✅ Adjusted income: {income_summary['total_income_adjusted']:,.2f}")
 
 
+def _process_one_safe(job: tuple[Path, dict]) -> tuple[str, Optional[str]]:
+    # top-level so it can be pickled for the process pool; returns (pdf name, error)
+    pdf_path, kwargs = job
+    try:
+        process_one_bcc(pdf_path=pdf_path, **kwargs)
+        return pdf_path.name, None
+    except Exception as e:
+        return pdf_path.name, str(e)
+
+
+def _report_failures(results) -> None:
+    for name, err in results:
+        if err is not None:
+            print(f"❌ Failed to process {name}: {err}")
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(
         description=(
@@ -295,9 +440,35 @@ def main() -> None:
         "--pdf-meta-dir",
         help="Folder for single JSON metadata files (default: <pdf_dir>/pdf_meta)",
     )
+    ap.add_argument(
+        "--pretty-meta-json",
+        action="store_true",
+        help="Write PDF metadata JSON indented (default: compact)",
+    )
+    ap.add_argument(
+        "--format",
+        choices=("csv", "parquet", "both"),
+        default="csv",
+        help=(
+            "Output format for transactions / tx_ip_enriched / ip_income_monthly "
+            "(default: csv; parquet needs pyarrow or fastparquet). "
+            "Header, footer, meta and income summary are always CSV."
+        ),
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=min(os.cpu_count() or 1, 4),
+        help="Number of PDFs processed in parallel (default: min(CPU count, 4)). 1 = sequential.",
+    )
 
     args = ap.parse_args()
 
+    if args.format != "csv" and not any(
+        importlib.util.find_spec(m) for m in ("pyarrow", "fastparquet")
+    ):
+        raise SystemExit("--format parquet/both requires pyarrow or fastparquet")
+
     in_path = Path(args.path)
 
     if in_path.is_file():
@@ -326,19 +497,29 @@ def main() -> None:
     print(f"Pages JSONL dir:    {jsonl_dir}")
     print(f"PDF meta dir:       {pdf_meta_dir}")
 
-    for pdf_path in pdf_files:
-        try:
-            process_one_bcc(
-                pdf_path=pdf_path,
-                jsonl_dir=jsonl_dir,
-                out_dir=out_dir,
-                pdf_meta_dir=pdf_meta_dir,
-                jsonl_suffix=args.jsonl_suffix,
-                months_back=args.months_back,
-                verbose=not args.no_verbose,
-            )
-        except Exception as e:
-            print(f"❌ Failed to process {pdf_path.name}: {e}")
+    workers = min(args.workers, len(pdf_files))
+    kwargs = dict(
+        jsonl_dir=jsonl_dir,
+        out_dir=out_dir,
+        pdf_meta_dir=pdf_meta_dir,
+        jsonl_suffix=args.jsonl_suffix,
+        months_back=args.months_back,
+        verbose=not args.no_verbose,
+        # PDFs are already spread over processes, so pages are extracted sequentially;
+        # a single-process run opts into per-page parallelism (None = CPU count)
+        page_workers=1 if workers > 1 else None,
+        pretty_meta_json=args.pretty_meta_json,
+        out_format=args.format,
+    )
+    jobs = [(pdf_path, kwargs) for pdf_path in pdf_files]
+
+    if workers <= 1:
+        _report_failures(map(_process_one_safe, jobs))
+        return
+
+    # PDFs are independent: parse them in parallel (worker output may interleave)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        _report_failures(ex.map(_process_one_safe, jobs))
 
 
 if __name__ == "__main__":
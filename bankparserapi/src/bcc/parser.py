@@ -19,8 +19,13 @@ import json
 
 import pandas as pd
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
 from src.bcc.header import parse_bcc_header
-from src.bcc.footer import parse_bcc_footer
+from src.bcc.footer import parse_bcc_footer_from_pages
 from src.bcc.transactions import parse_bcc_transactions_camelot
 
 
@@ -36,6 +41,7 @@ def load_jsonl(path: str) -> List[Dict[str, Any]]:
     validated_path = validate_path(path)
     
     pages: List[Dict[str, Any]] = []
+    loads = orjson.loads if orjson is not None else json.loads
 
     with open(validated_path, "r", encoding="utf-8") as f:
         for line in f:
@@ -43,8 +49,8 @@ def load_jsonl(path: str) -> List[Dict[str, Any]]:
             if not line:
                 continue
             try:
-                pages.append(json.loads(line))
-            except json.JSONDecodeError as e:
+                pages.append(loads(line))
+            except json.JSONDecodeError as e:  # orjson's error subclasses it
                 raise ValueError(
                     f"Invalid JSON in {path!r}: {line[:200]!r}"
                 ) from e
@@ -76,6 +82,7 @@ def parse_bcc_statement(
     footer_df : DataFrame (1 row)
     """
     # 1) HEADER: текст первой страницы из JSONL
+    #    (JSONL читаем один раз — те же страницы идут в футер)
     pages = load_jsonl(jsonl_path)
     page1 = next((p for p in pages if p.get("page_num") in (1, "1")), pages[0])
     page1_text = page1.get("text") or ""
@@ -84,8 +91,8 @@ def parse_bcc_statement(
     # 2) TRANSACTIONS: тянем Camelot-ом из PDF
     tx_df = parse_bcc_transactions_camelot(pdf_path)
 
-    # 3) FOOTER: из JSONL
-    footer_dict = parse_bcc_footer(jsonl_path)
+    # 3) FOOTER: из тех же страниц JSONL
+    footer_dict = parse_bcc_footer_from_pages(pages)
     footer_df = pd.DataFrame([footer_dict])
 
     return header_df, tx_df, footer_df
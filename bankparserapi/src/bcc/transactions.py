@@ -2,14 +2,15 @@
 # -*- coding: utf-8 -*-
 
 """
-Parse BCC transactions table directly from PDF using Camelot.
+Parse BCC transactions table directly from PDF using PyMuPDF (Camelot as fallback).
 
 Assumes relatively stable layout:
 - one big table per page
 - 12 columns (docno, date, BIC, IBAN, ... bank, purpose)
 """
 
-import camelot
+import re
+
 import pandas as pd
 from typing import List
 
@@ -28,44 +29,92 @@ COLS = [
     "Төлемнің мақсаты / Назначение платежа",
 ]
 
-def parse_bcc_transactions_camelot(pdf_path: str) -> pd.DataFrame:
+_WS_RE = re.compile(r"\s+")
+
+# Camelot settings for the BCC layout (stable across statements)
+_CAMELOT_LATTICE_KW = dict(
+    flavor="lattice",
+    process_background=False,  # explicit: no extra pass for background (shaded) lines
+)
+_CAMELOT_STREAM_KW = dict(
+    flavor="stream",
+    table_areas=["36,780,560,80"],  # top,left,bottom,right
+    columns=["60,110,200,270,340,410,470,520"],
+    strip_text="\n",
+)
+
+
+def _norm_ws(col: pd.Series) -> pd.Series:
+    """Collapse whitespace runs to one space and trim; non-text columns as is."""
+    # object (pandas 2) or str dtype (pandas 3 default for text)
+    if not (pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col)):
+        return col
+    return col.str.replace(_WS_RE, " ", regex=True).str.strip()
+
+def _read_tables_pymupdf(pdf_path: str) -> List[pd.DataFrame]:
     """
-    Extract the transaction table from BCC statement using Camelot.
+    Ruled tables of every page via PyMuPDF page.find_tables() (MuPDF, no
+    Ghostscript). Rows come from Table.extract(), so header rows stay data
+    rows, as in Camelot's t.df. [] if PyMuPDF is missing or fails.
+    """
+    try:
+        import fitz  # pymupdf
+    except ImportError:
+        return []
+    try:
+        with fitz.open(pdf_path) as doc:
+            return [
+                pd.DataFrame(t.extract())
+                for page in doc
+                for t in page.find_tables().tables
+            ]
+    except Exception:
+        return []
 
+
+def _read_tables_camelot(pdf_path: str) -> List[pd.DataFrame]:
+    """
     1. Use lattice (if there are visible grid lines).
     2. If that fails, fall back to stream with calibrated table area & columns.
     """
+    import camelot  # lazy: only needed when PyMuPDF finds no usable table
+
     # --- try lattice first ---
     tables: List[camelot.core.Table] = []
     try:
-        tables = camelot.read_pdf(
-            pdf_path,
-            pages="all",
-            flavor="lattice",
-        )
+        tables = camelot.read_pdf(pdf_path, pages="all", **_CAMELOT_LATTICE_KW)
     except Exception:
         tables = []
 
     if not tables:
         # fallback: stream + manual calibration
-        tables = camelot.read_pdf(
-            pdf_path,
-            pages="all",
-            flavor="stream",
-            table_areas=["36,780,560,80"],  # top,left,bottom,right
-            columns=["60,110,200,270,340,410,470,520"],
-            strip_text="\n",
-        )
+        tables = camelot.read_pdf(pdf_path, pages="all", **_CAMELOT_STREAM_KW)
 
     if not tables:
         raise RuntimeError(f"No tables parsed from {pdf_path}")
 
+    return [t.df for t in tables]
+
+
+def parse_bcc_transactions_camelot(pdf_path: str) -> pd.DataFrame:
+    """
+    Extract the transaction table from BCC statement.
+
+    1. PyMuPDF find_tables (grid lines, like Camelot lattice) — much faster,
+       no Ghostscript.
+    2. If it finds nothing or not exactly 12 columns, Camelot lattice,
+       then stream with calibrated table area & columns.
+    """
     # Склеиваем все страницы
-    df_list = [t.df for t in tables]
-    df_raw = pd.concat(df_list, ignore_index=True)
+    df_list = _read_tables_pymupdf(pdf_path)
+    df_raw = pd.concat(df_list, ignore_index=True) if df_list else None
+    if df_raw is None or df_raw.shape[1] != len(COLS):
+        df_raw = pd.concat(_read_tables_camelot(pdf_path), ignore_index=True)
 
     # Первая строка почти всегда заголовок — дропаем
-    df_raw = df_raw.iloc[1:].reset_index(drop=True)
+    # (срез + новый RangeIndex вместо reset_index, который копирует весь фрейм)
+    df_raw = df_raw.iloc[1:]
+    df_raw.index = pd.RangeIndex(len(df_raw))
 
     # Подрезаем до 12 колонок и даём им наши имена
     if df_raw.shape[1] != len(COLS):
@@ -74,13 +123,13 @@ def parse_bcc_transactions_camelot(pdf_path: str) -> pd.DataFrame:
     df_raw.columns = COLS
 
     # Нормализация пробелов
-    df = df_raw.applymap(lambda x: " ".join(str(x).split()) if isinstance(x, str) else x)
-
-    # выбрасываем пустые по дате
-    df = df.dropna(subset=["Күні / Дата"])
+    df = df_raw.apply(_norm_ws)
 
-    # И **дропаем последний ряд** – там твой футер
-    if not df.empty:
-        df = df.iloc[:-1]
+    # **дропаем последний ряд** – там твой футер (по позиции: у строки
+    # «Жиынтығы / Итого» дата пустая), затем выбрасываем пустые по дате
+    # (NaN и "" после нормализации); одна маска, один срез
+    mask = df["Күні / Дата"].fillna("").astype(str).str.strip().ne("")
+    if not mask.empty:
+        mask.iloc[-1] = False
 
-    return df
+    return df.loc[mask]
@@ -10,7 +10,7 @@ from src.kaspi_gold.parser import parse_kaspi_statement_v6b
 from src.utils.income_calc import compute_ip_income
 from src.utils.kaspi_gold_related_parties import (
     summarize_kaspi_gold_persons,
-    _extract_person_name_from_details,
+    extract_person_names,
 )
 from src.ui.ui_analysis_report_generator import get_ui_analysis_tables
 
@@ -86,7 +86,7 @@ def process_kaspi_pdf(pdf_path: Path, out_dir: Path) -> None:
     else:
         share_map, excl_map = {}, {}
 
-    tx_df["kp_person_name"] = tx_df["details"].apply(_extract_person_name_from_details)
+    tx_df["kp_person_name"] = extract_person_names(tx_df["details"])
     tx_df["kp_is_related_party"] = tx_df["kp_person_name"].notna()
     tx_df["kp_outgoing_share_pct"] = tx_df["kp_person_name"].map(share_map)
     tx_df["kp_exclude_from_income"] = tx_df["kp_person_name"].map(excl_map).fillna(False)
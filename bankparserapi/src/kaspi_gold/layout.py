@@ -1,6 +1,6 @@
 # src/kaspi_parser/layout.py
 
-from typing import Dict, List, Tuple, Any, Set
+from typing import Dict, List, Tuple, Any, Set, Optional
 import numpy as np
 import pandas as pd
 import fitz
@@ -243,11 +243,23 @@ def find_clock_rows(row_bands: Dict[int, RowBand],
 
 
 
+_RE_TX_DATE = re.compile(r"^\d{2}\.\d{2}\.\d{2,4}$")
+_RE_GLUED_SPLIT = re.compile(r"\s{2,}")
+
+TX_COLUMNS = ("page", "date", "amount", "operation", "details", "clock_icon", "amount_text")
+
+
+def new_tx_columns() -> Dict[str, List[Any]]:
+    """Empty column-wise transaction buffer ({column: []} for TX_COLUMNS)."""
+    return {col: [] for col in TX_COLUMNS}
+
+
 def rebuild_transactions_from_page(
     df: pd.DataFrame,
     page_index: int,
     clock_rows: Set[int],
-) -> List[Dict[str, Any]]:
+    out: Optional[Dict[str, List[Any]]] = None,
+) -> Dict[str, List[Any]]:
     """
     Reconstruct structured transaction rows from the span dataframe for the page.
     Steps:
@@ -257,24 +269,33 @@ def rebuild_transactions_from_page(
     - parse amount
     - fallback parse if amount is 0.0
     - split operation/details if glued
-    """
-    tx_rows: List[Dict[str, Any]] = []
-
-    for rid, g in df.groupby("row_id"):
-        # collect cell text by column
-        cells = {
-            cid: " ".join(gg.sort_values("x0")["text"].tolist()).strip()
-            for cid, gg in g.groupby("col_id")
-        }
 
+    Rows are appended column-wise to `out` (see new_tx_columns()), so several
+    pages can share one buffer and become a DataFrame without per-row dicts.
+    Returns `out`.
+    """
+    tx_cols = out if out is not None else new_tx_columns()
+
+    # merge cell texts for the whole page with one sort + one groupby,
+    # instead of a nested groupby/sort_values per row
+    cell_text = (
+        df.sort_values(["row_id", "col_id", "x0"], kind="stable")
+        .groupby(["row_id", "col_id"], sort=True)["text"]
+        .agg(" ".join)
+    )
+    cells_by_row: Dict[int, Dict[int, str]] = {}
+    for (rid, cid), txt in cell_text.items():
+        cells_by_row.setdefault(rid, {})[cid] = txt.strip()
+
+    for rid, cells in cells_by_row.items():
         date_str = cells.get(0, "")
 
         # 1. must have a date in the first col
-        if not isinstance(date_str, str) or not date_str:
+        if not date_str:
             continue
 
         # strictly require dd.mm.yy or dd.mm.yyyy
-        if not re.match(r"^\d{2}\.\d{2}\.\d{2,4}$", date_str):
+        if not _RE_TX_DATE.match(date_str):
             continue
 
         amount_text = cells.get(1, "")
@@ -295,21 +316,19 @@ def rebuild_transactions_from_page(
         # 4. Sometimes operation+details are glued into col 2.
         #    ex: "Перевод  Kaspi Pay QWERTY  +1 000 ₸"
         if operation and not details:
-            parts = re.split(r"\s{2,}", operation, maxsplit=1)
+            parts = _RE_GLUED_SPLIT.split(operation, maxsplit=1)
             if len(parts) == 2:
                 operation, details = parts[0], parts[1]
 
-        tx_rows.append({
-            "page": page_index,
-            "date": date_str,
-            "amount": amt_val,
-            "operation": operation or "",
-            "details": details or "",
-            "clock_icon": bool(rid in clock_rows),
-            "amount_text": amount_text,
-        })
-
-    return tx_rows
+        tx_cols["page"].append(page_index)
+        tx_cols["date"].append(date_str)
+        tx_cols["amount"].append(amt_val)
+        tx_cols["operation"].append(operation or "")
+        tx_cols["details"].append(details or "")
+        tx_cols["clock_icon"].append(rid in clock_rows)
+        tx_cols["amount_text"].append(amount_text or "")
+
+    return tx_cols
 # ---------- FONT REGION ANALYSIS FOR VISUAL CHECKS ----------
 
 def collect_span_info(doc: fitz.Document) -> pd.DataFrame:
@@ -374,6 +393,24 @@ def define_regions(first_page: fitz.Page) -> Dict[str, Tuple[float, float]]:
     }
 
 
+def label_regions(
+    span_df: pd.DataFrame,
+    regions: Dict[str, Tuple[float, float]]
+) -> pd.DataFrame:
+    """
+    Add a categorical 'region' column (categories = region names) telling which
+    region each span's y0 falls in ([y_start, y_end)); spans outside every
+    region get NaN. Mutates and returns span_df.
+    """
+    y0 = span_df["y0"].to_numpy(dtype=float)
+    codes = np.full(len(span_df), -1, dtype=np.int8)
+    for code, (y_start, y_end) in enumerate(regions.values()):
+        codes[(codes == -1) & (y0 >= y_start) & (y0 < y_end)] = code
+
+    span_df["region"] = pd.Categorical.from_codes(codes, categories=list(regions))
+    return span_df
+
+
 def analyze_regions(
     span_df: pd.DataFrame,
     regions: Dict[str, Tuple[float, float]]
@@ -383,33 +420,29 @@ def analyze_regions(
       - fonts: set of font family names in that band
       - sizes_body: set of rounded body font sizes in [8.5, 11.5]
     We mostly use page 0 (first page), because that's where scammers edit totals.
+
+    If span_df already carries a 'region' column (see label_regions) it is reused,
+    otherwise regions are assigned here.
     """
-    out: Dict[str, Dict[str, Any]] = {}
+    out: Dict[str, Dict[str, Any]] = {
+        region_name: {"fonts": set(), "sizes_body": set()}
+        for region_name in regions
+    }
 
-    first_page_spans = span_df[span_df["page"] == 0].copy()
+    first_page_spans = span_df[span_df["page"] == 0]
     if first_page_spans.empty:
         # fallback (1-page pdf or weird pdf)
-        first_page_spans = span_df.copy()
-
-    for region_name, (y_start, y_end) in regions.items():
-        region_spans = first_page_spans[
-            (first_page_spans["y0"] >= y_start) &
-            (first_page_spans["y0"] <  y_end)
-        ].copy()
-
-        fonts_set = set()
-        sizes_set = set()
+        first_page_spans = span_df
 
-        for _, r in region_spans.iterrows():
-            f = r["font"].lower().strip()
-            s = float(r["size"])
-            fonts_set.add(f)
-            if 8.5 <= s <= 11.5:
-                sizes_set.add(round(s, 1))
+    if "region" not in first_page_spans.columns:
+        first_page_spans = label_regions(first_page_spans.copy(), regions)
 
+    for region_name, g in first_page_spans.groupby("region", observed=True):
+        sizes = g["size"].astype(float)
+        body_sizes = sizes[(sizes >= 8.5) & (sizes <= 11.5)]
         out[region_name] = {
-            "fonts": fonts_set,
-            "sizes_body": sizes_set,
+            "fonts": set(g["font"].str.lower().str.strip()),
+            "sizes_body": {round(sz, 1) for sz in body_sizes.tolist()},
         }
 
     return out
@@ -14,8 +14,10 @@ from src.kaspi_gold.layout import (
     build_row_bands,
     find_clock_rows,
     rebuild_transactions_from_page,
+    new_tx_columns,
     collect_span_info,
-    define_regions, cluster_rows_by_y
+    define_regions, cluster_rows_by_y,
+    label_regions,
 )
 from src.kaspi_gold.extractors import (
     find_period,
@@ -42,9 +44,12 @@ from src.kaspi_gold.checks_consistency import (
     check_tx_date_sorting,
     check_summary_sign_rules
 )
+import json
 import re
 from src.kaspi_gold.utils import RowBand, cluster_rows_by_y, parse_amount, AMOUNT_ROW_REGEX
 
+_NAME_CARD_ACCOUNT_ANCHORS = ("Kaspi Gold", "Номер карты:", "Номер счета:")
+
 def _extract_name_card_account(full_text: str) -> dict[str, str]:
     """
     Из полного текста первой страницы вытаскиваем:
@@ -53,6 +58,10 @@ def _extract_name_card_account(full_text: str) -> dict[str, str]:
       - card_mask  (Номер карты: *XXXX)
       - account_number (Номер счета: KZ...)
     """
+    # nothing below can match without one of these anchors (image-only / broken text)
+    if not full_text or not any(s in full_text for s in _NAME_CARD_ACCOUNT_ANCHORS):
+        return {"client_name": "", "card_mask": "", "account_number": ""}
+
     lines = [ln.strip() for ln in full_text.splitlines() if ln.strip()]
 
     client_name_parts: List[str] = []
@@ -141,6 +150,11 @@ def _extract_available_and_currency(
     available_balance: float | None = None
     account_currency_name = ""
 
+    # span texts as str, computed once and shared by the fallbacks below
+    span_texts: Optional[pd.Series] = None
+    if not spans_df.empty:
+        span_texts = spans_df["text"].astype(str)
+
     # -------------------- STEP 1: DATE --------------------
     # Try clean text first
     m = re.search(r"Доступно\s*на\s*(\d{2}\.\d{2}\.\d{2})", full_text)
@@ -148,9 +162,8 @@ def _extract_available_and_currency(
         available_date = m.group(1)
 
     # Fallback: sometimes text is broken, so check spans too
-    if not available_date and not spans_df.empty:
-        for _, row in spans_df.iterrows():
-            txt = str(row.get("text", ""))
+    if not available_date and span_texts is not None:
+        for txt in span_texts:
             if "Доступно" in txt:
                 m = re.search(r"(\d{2}\.\d{2}\.\d{2})", txt)
                 if m:
@@ -179,47 +192,43 @@ def _extract_available_and_currency(
             except ValueError:
                 pass
 
-    candidate_amounts: list[float] = []
+    # STEPS 3-5 are fallbacks only: skip them entirely once STEP 2 found the amount
+    if available_balance is None:
+        candidate_amounts: list[float] = []
 
-    # -------------------- STEP 3: old span-based search (fallback) --------------------
-    if available_balance is None and not spans_df.empty:
-        access_rows = spans_df[
-            spans_df["text"].astype(str).str.contains("Доступно", case=False, na=False)
-        ]
-
-        for _, r in access_rows.iterrows():
-            y = r["y0"]
-
-            zone = spans_df[
-                (spans_df["y0"] > y - 40) &
-                (spans_df["y0"] < y + 120)
+        # -------------------- STEP 3: old span-based search (fallback) --------------------
+        if span_texts is not None:
+            access_rows = spans_df[
+                span_texts.str.contains("Доступно", na=False, regex=False)
             ]
 
-            for _, z in zone.iterrows():
-                txt = str(z["text"])
-                try:
-                    val, _ = parse_amount(txt)
-                    candidate_amounts.append(val)
-                except Exception:
-                    pass
-
-    # -------------------- STEP 4: harsh text fallback --------------------
-    if available_balance is None and not candidate_amounts:
-        lines = [ln.strip() for ln in full_text.splitlines() if ln.strip()]
-        for i, ln in enumerate(lines):
-            if "Доступно на" in ln:
-                for j in range(0, 6):
-                    if i + j < len(lines):
-                        try:
-                            val, _ = parse_amount(lines[i + j])
-                            candidate_amounts.append(val)
-                        except Exception:
-                            pass
-
-    # -------------------- STEP 5: choose value --------------------
-    if available_balance is None and candidate_amounts:
-        # take the largest → almost always correct for Kaspi Gold
-        available_balance = max(candidate_amounts)
+            for y in access_rows["y0"]:
+                zone_mask = (spans_df["y0"] > y - 40) & (spans_df["y0"] < y + 120)
+
+                for txt in span_texts[zone_mask]:
+                    try:
+                        val, _ = parse_amount(txt)
+                        candidate_amounts.append(val)
+                    except Exception:
+                        pass
+
+        # -------------------- STEP 4: harsh text fallback --------------------
+        if not candidate_amounts:
+            lines = [ln.strip() for ln in full_text.splitlines() if ln.strip()]
+            for i, ln in enumerate(lines):
+                if "Доступно на" in ln:
+                    for j in range(0, 6):
+                        if i + j < len(lines):
+                            try:
+                                val, _ = parse_amount(lines[i + j])
+                                candidate_amounts.append(val)
+                            except Exception:
+                                pass
+
+        # -------------------- STEP 5: choose value --------------------
+        if candidate_amounts:
+            # take the largest → almost always correct for Kaspi Gold
+            available_balance = max(candidate_amounts)
 
     # -------------------- STEP 6: currency --------------------
     m_curr = re.search(r"Валюта\s+счета\s*:\s*([^\n]+)", full_text)
@@ -243,10 +252,11 @@ def parse_kaspi_statement_v6b(pdf_path: str,
         regions = define_regions(doc[0])
     else:
         regions = {"header": (0, 1e9), "summary": (0, 1e9), "tx_table": (0, 1e9)}
+    # region membership is shared by both visual font checks below
+    label_regions(span_df, regions)
 
     # metadata (initial flags + score)
     meta_info = extract_pdf_meta(doc)
-    meta_df = pd.DataFrame([meta_info])
 
     header = {
         "period_start": "",
@@ -264,7 +274,7 @@ def parse_kaspi_statement_v6b(pdf_path: str,
     }
 
 
-    tx_rows: List[Dict] = []
+    tx_columns = new_tx_columns()
     summary_reported: Dict[str, float] = {}
     opening_balance: Optional[float] = None
     closing_balance: Optional[float] = None
@@ -276,7 +286,13 @@ def parse_kaspi_statement_v6b(pdf_path: str,
         page = doc[p]
 
         if p == 0:
-            full_text = page.get_text("text")
+            # header fields and the "Доступно на" balances all sit above the
+            # tx table, so only keep text blocks starting above it
+            tx_table_top = regions["tx_table"][0]
+            full_text = "\n".join(
+                b[4] for b in page.get_text("blocks")
+                if b[6] == 0 and b[1] < tx_table_top
+            )
             header["period_start"], header["period_end"] = find_period(full_text)
             header["iban"] = find_iban(full_text)
             header["currency"] = find_currency(full_text)
@@ -299,9 +315,16 @@ def parse_kaspi_statement_v6b(pdf_path: str,
             header["available_balance"] = avail_balance
             header["account_currency_name"] = acc_curr_name
 
-            summary_reported = extract_summary_reported_from_page(page)
+            # page-0 spans are already in span_df: reuse them instead of
+            # letting each extractor decode the page via get_text("dict")
+            page0_spans = (
+                span_df.loc[span_df["page"] == 0, ["text", "x0", "y0", "x1", "y1"]]
+                .sort_values(["y0", "x0"])
+                .reset_index(drop=True)
+            )
+            summary_reported = extract_summary_reported_from_page(page, page0_spans)
 
-            balances = extract_balances_from_page(page)
+            balances = extract_balances_from_page(page, page0_spans)
             opening_balance = balances.get("opening_balance")
             closing_balance = balances.get("closing_balance")
 
@@ -321,16 +344,11 @@ def parse_kaspi_statement_v6b(pdf_path: str,
         df = assign_cols(df, splits)
         row_bands = build_row_bands(df)
         clock_rows = find_clock_rows(row_bands, icon_bands)
-        rows_from_page = rebuild_transactions_from_page(df, p, clock_rows)
-        tx_rows.extend(rows_from_page)
+        rebuild_transactions_from_page(df, p, clock_rows, out=tx_columns)
 
-    header_df = pd.DataFrame([header])
-    tx_df = pd.DataFrame(tx_rows)
-    if not tx_df.empty:
-        tx_df["operation"] = tx_df["operation"].fillna("")
-        tx_df["details"] = tx_df["details"].fillna("")
-        tx_df["amount_text"] = tx_df["amount_text"].fillna("")
-        tx_df["amount"] = tx_df["amount"].fillna(0.0)
+    header_df = pd.DataFrame.from_dict({0: header}, orient="index")
+    # text columns are already defaulted to "" while building, no fillna needed
+    tx_df = pd.DataFrame(tx_columns, copy=False)
 
     # -------- CHECKS --------
 
@@ -372,10 +390,8 @@ def parse_kaspi_statement_v6b(pdf_path: str,
     if f:
         extra_flags.append(f)
         # capture unique sizes
-        sizes = []
-        for pg in doc:
-            sizes.append((round(pg.rect.width), round(pg.rect.height)))
-        debug_info[f] = {"page_sizes": list(dict.fromkeys(sizes))}
+        sizes = {(round(pg.rect.width), round(pg.rect.height)) for pg in doc}
+        debug_info[f] = {"page_sizes": sorted(sizes)}
 
     odd_flag, odd_debug = check_odd_page_aspect(doc)
     if odd_flag:
@@ -407,11 +423,8 @@ def parse_kaspi_statement_v6b(pdf_path: str,
     if roll_flag:
         extra_flags.append(roll_flag)
 
-    if roll_flag:
-        extra_flags.append(roll_flag)
-
     # -------- MERGE FLAGS / SCORE --------
-    base_flags = meta_df.loc[0, "flags"]
+    base_flags = meta_info.get("flags")
     if isinstance(base_flags, list):
         existing_flags_list = base_flags
     elif isinstance(base_flags, str) and base_flags.strip():
@@ -427,16 +440,17 @@ def parse_kaspi_statement_v6b(pdf_path: str,
     )
     deduped_flags = list(dict.fromkeys(all_flags))
 
-    meta_df.loc[0, "flags"] = ";".join(deduped_flags)
-    meta_df.loc[0, "score"] = 100 - 5 * len(deduped_flags)
-
-
-    meta_df.loc[0, "debug_info"] = str(debug_info)
-    meta_df.loc[0, "summary_reported"] = str(summary_reported)
-    meta_df.loc[0, "summary_diffs"] = str(summary_diffs)
-    meta_df.loc[0, "opening_balance"] = opening_balance if opening_balance is not None else ""
-    meta_df.loc[0, "closing_balance"] = closing_balance if closing_balance is not None else ""
-    meta_df.loc[0, "rollforward_sum_tx"] = float(tx_df["amount"].sum()) if not tx_df.empty else 0.0
-    meta_df[["flags", "score", "debug_info"]].to_string(index=False)
+    # build the single meta row in one go instead of .loc[0, col] writes
+    meta_df = pd.DataFrame([{
+        **meta_info,
+        "flags": ";".join(deduped_flags),
+        "score": 100 - 5 * len(deduped_flags),
+        "debug_info": json.dumps(debug_info, ensure_ascii=False, default=str),
+        "summary_reported": json.dumps(summary_reported, ensure_ascii=False, default=str),
+        "summary_diffs": json.dumps(summary_diffs, ensure_ascii=False, default=str),
+        "opening_balance": opening_balance if opening_balance is not None else "",
+        "closing_balance": closing_balance if closing_balance is not None else "",
+        "rollforward_sum_tx": float(tx_df["amount"].sum()) if not tx_df.empty else 0.0,
+    }])
 
     return header_df, tx_df, meta_df
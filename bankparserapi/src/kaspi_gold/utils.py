@@ -1,6 +1,7 @@
 # src/kaspi_parser/utils.py
 import re
 from datetime import datetime
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 import fitz
@@ -17,26 +18,30 @@ class RowBand:
     y_top: float
     y_bottom: float
 
+# parse_amount is called per span/cell, so keep its patterns and tables prebuilt
+_RE_AMT_CHARSTRIP = re.compile(rf"[^\d,.\-()+{SPACE_CHARS_CLASS}]")
+_RE_AMT_MATCH = re.compile(r"^([+-]?)(\d+(?:\.\d+)?)$")
+_RE_AMT_LOOSE = re.compile(r"[^0-9.]")
+_AMT_SPACE_TABLE = str.maketrans({"\u00A0": " ", "\u202F": " "})
+_AMT_NUM_TABLE = str.maketrans({" ": None, ",": "."})
+
 def parse_amount(text: str) -> float:
     if not text:
         return 0.0
-    s = re.sub(rf"[^\d,.\-()+{SPACE_CHARS_CLASS}]", "", text)
-    s = s.replace("\u00A0"," ").replace("\u202F"," ").strip()
+    s = _RE_AMT_CHARSTRIP.sub("", text).translate(_AMT_SPACE_TABLE).strip()
     neg = s.startswith("(") and s.endswith(")")
-    s = s.strip("()").replace(" ","").replace(",",".")
-    m = re.match(r"^([+-]?)(\d+(?:\.\d+)?)$", s)
+    s = s.strip("()").translate(_AMT_NUM_TABLE)
+    m = _RE_AMT_MATCH.match(s)
     if not m:
-        s2 = re.sub(r"[^0-9.]", "", s)
+        s2 = _RE_AMT_LOOSE.sub("", s)
         try:
             v = float(s2) if s2 else 0.0
-        except:
+        except ValueError:
             v = 0.0
         return -v if neg else v
     sign, num = m.groups()
     v = float(num)
-    if neg or sign == "-":
-        v = -v
-    return v
+    return -v if (neg or sign == "-") else v
 
 def cluster_rows_by_y(y_values: np.ndarray, tol: float = 3.0) -> np.ndarray:
     order = np.argsort(y_values)
@@ -54,6 +59,19 @@ def cluster_rows_by_y(y_values: np.ndarray, tol: float = 3.0) -> np.ndarray:
             groups[idx] = gid
     return groups
 
+_RE_TZ_STRIP = re.compile(r"[+\-]\d{2}'?\d{2}'?$")
+_RE_NONDIGIT = re.compile(r"\D")
+# (format, number of digits it consumes)
+_PDF_DT_FORMATS = (
+    ("%Y%m%d%H%M%S", 14),
+    ("%Y%m%d%H%M", 12),
+    ("%Y%m%d%H", 10),
+    ("%Y%m%d", 8),
+)
+_DDMMY_FORMATS = ("%d.%m.%y", "%d.%m.%Y")
+
+
+@lru_cache(maxsize=4096)
 def _safe_dt(dt_str: Optional[str]) -> Optional[datetime]:
     """Parse PDF date strings like 'D:20251029120000+05\'00\''."""
     if not dt_str:
@@ -61,12 +79,11 @@ def _safe_dt(dt_str: Optional[str]) -> Optional[datetime]:
     s = dt_str.strip()
     if s.startswith("D:"):
         s = s[2:]
-    s = re.sub(r"[+\-]\d{2}'?\d{2}'?$", "", s)
-    s_digits = re.sub(r"\D", "", s)
-    fmts = ["%Y%m%d%H%M%S", "%Y%m%d%H%M", "%Y%m%d%H", "%Y%m%d"]
-    for f in fmts:
+    s = _RE_TZ_STRIP.sub("", s)
+    s_digits = _RE_NONDIGIT.sub("", s)
+    for f, n_digits in _PDF_DT_FORMATS:
         try:
-            return datetime.strptime(s_digits[:len(datetime.now().strftime(f))], f)
+            return datetime.strptime(s_digits[:n_digits], f)
         except ValueError:
             continue
     try:
@@ -75,11 +92,12 @@ def _safe_dt(dt_str: Optional[str]) -> Optional[datetime]:
         return None
 
 
+@lru_cache(maxsize=4096)
 def to_ddmmy_date(s: str) -> Optional[datetime]:
     """
     Parse '01.09.24' or '01.09.2024' to datetime or None.
     """
-    for fmt in ("%d.%m.%y", "%d.%m.%Y"):
+    for fmt in _DDMMY_FORMATS:
         try:
             return datetime.strptime(s, fmt)
         except ValueError:
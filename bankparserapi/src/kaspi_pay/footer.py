@@ -13,9 +13,11 @@ INT_RE = re.compile(r"\b\d+\b")
 DATE_RE = re.compile(r"\b(\d{2}\.\d{2}\,\d{4}|\d{2}\.\d{2}\.\d{4})\b")
 TIME_RE = re.compile(r"\b\d{2}:\d{2}(?::\d{2})?\b")
 BIC_RE  = re.compile(r"\b[A-Z]{8}\b")
-FOOTER_TRIG = re.compile(
-    r"(?i)\bитого\b|итого обороты|итого операций|отчет сформирован|наименование и бик|бик[:\s]*[A-Z]{4,8}"
-)
+# footer trigger: "итого" (word), "отчет сформирован", "наименование и бик",
+# or an inline BIC ("Бик: ABCDKZKA"); see _is_footer_trigger()
+_RE_ITOGO_WORD = re.compile(r"\bитого\b")
+_RE_BIC_INLINE = re.compile(r"бик[:\s]*[A-Z]{4,8}", re.IGNORECASE)
+_RE_BIK_SEP = re.compile(r"\sБик[:\s]", re.IGNORECASE)
 
 def _to_float(s: str) -> Optional[float]:
     if not s:
@@ -52,9 +54,21 @@ def _to_int_amount(s: str) -> Optional[int]:
 def _norm(txt: str) -> str:
     return re.sub(r"\s+", " ", txt).strip()
 
+def _is_footer_trigger(txt: str, low: str) -> bool:
+    # cheap substring tests first; regexes only run when their keyword is present
+    return (
+        "отчет сформирован" in low
+        or "наименование и бик" in low
+        or ("итого" in low and _RE_ITOGO_WORD.search(low) is not None)
+        or ("бик" in low and _RE_BIC_INLINE.search(txt) is not None)
+    )
+
 # =========================
 # Geometric line clustering
 # =========================
+LINE_Y_EPS = 1.8  # vertical tolerance (pt) for words on the same line
+
+
 def _flatten_words(pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     out = []
     for pi, p in enumerate(pages):
@@ -69,28 +83,26 @@ def _flatten_words(pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     out.sort(key=lambda w: (w["_pi"], round(float(w["top"]), 3), round(float(w["x0"]), 3)))
     return out
 
-def _cluster_lines(words: List[Dict[str, Any]], y_eps: float = 1.8) -> List[List[Dict[str, Any]]]:
-    if not words:
-        return []
+def _cluster_lines(words: List[Dict[str, Any]], y_eps: float = LINE_Y_EPS) -> List[List[Dict[str, Any]]]:
+    """
+    Group words sorted by _flatten_words into lines: a word joins the current
+    line while it is on the same page and within y_eps of the line's first top
+    (relative tolerance, so words straddling any fixed grid stay together).
+    """
     lines: List[List[Dict[str, Any]]] = []
     cur: List[Dict[str, Any]] = []
-    cur_top: Optional[float] = None
-    cur_page: Optional[int] = None
-
+    cur_top = 0.0
+    cur_page = -1
     for w in words:
         top = float(w["top"])
-        pi  = int(w["_pi"])
+        pi = int(w["_pi"])
         if cur and (pi != cur_page or abs(top - cur_top) > y_eps):
-            # flush line
             cur.sort(key=lambda z: float(z["x0"]))
             lines.append(cur)
             cur = []
-            cur_top = None
-            cur_page = None
+        if not cur:
+            cur_top, cur_page = top, pi
         cur.append(w)
-        cur_top = top if cur_top is None else cur_top
-        cur_page = pi if cur_page is None else cur_page
-
     if cur:
         cur.sort(key=lambda z: float(z["x0"]))
         lines.append(cur)
@@ -152,7 +164,8 @@ def parse_footer_from_pages(pages: List[Dict[str, Any]]) -> pd.DataFrame:
         txt = _norm(" ".join(w["text"] for w in ln))
         if not txt:
             continue
-        is_footerish = bool(FOOTER_TRIG.search(txt))
+        low = txt.lower()
+        is_footerish = _is_footer_trigger(txt, low)
         # Also consider very bottom lines: big top value per page often means footer
         # (we keep it simple: if we already matched something footerish on the same page,
         # we treat the following few lines as footer continuation)
@@ -161,11 +174,9 @@ def parse_footer_from_pages(pages: List[Dict[str, Any]]) -> pd.DataFrame:
 
         matched_lines.append(txt)
 
-        low = txt.lower()
-
         # --- Итого обороты в нац. валюте -> two amounts (debit, credit)
         if "итого обороты" in low:
-            amts = [m.group(0) for m in AMOUNT_RE.finditer(txt)]
+            amts = AMOUNT_RE.findall(txt)
             if len(amts) >= 2:
                 meta["total_debit_turnover"]  = _to_float(amts[0])
                 meta["total_credit_turnover"] = _to_float(amts[1])
@@ -179,7 +190,7 @@ def parse_footer_from_pages(pages: List[Dict[str, Any]]) -> pd.DataFrame:
         # --- Итого операций за период -> two integers (debit_count, credit_count)
         if "итого операций" in low:
             # пример текста: "Итого операций за период 1 943 429"
-            ints = [int(m.group(0)) for m in INT_RE.finditer(txt)]
+            ints = [int(s) for s in INT_RE.findall(txt)]
 
             debit_count: Optional[int] = None
             credit_count: Optional[int] = None
@@ -248,7 +259,7 @@ def parse_footer_from_pages(pages: List[Dict[str, Any]]) -> pd.DataFrame:
             if ":" in txt:
                 after_colon = txt.split(":", 1)[1].strip()
                 # drop trailing 'Бик ...'
-                name_candidate = re.split(r"\sБик[:\s]", after_colon, flags=re.IGNORECASE)[0].strip()
+                name_candidate = _RE_BIK_SEP.split(after_colon, maxsplit=1)[0].strip()
             # fallback: take chunk around the word 'Банк'
             if not name_candidate and "Банк" in txt:
                 # take from first 'Банк' word backwards a bit
@@ -274,5 +285,6 @@ def parse_footer_from_pages(pages: List[Dict[str, Any]]) -> pd.DataFrame:
     if not meta["servicing_bank_bic"]:
         meta["flags"].append("servicing_bank_bic_missing")
 
-    return pd.DataFrame([meta], columns=cols)
+    # one row: build column-wise, skipping the list-of-dicts inference path
+    return pd.DataFrame({c: [meta[c]] for c in cols})
 
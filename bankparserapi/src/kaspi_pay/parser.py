@@ -8,7 +8,7 @@ Takes:
   - pages JSONL (output of convert_pdf_json_pages.py)
 
 Uses:
-  - header.parse_header_page(page)              → header_df (1 row)
+  - header.parse_header_page(page)              → header dict → header_df (1 row)
   - transactions.parse_transactions_from_pages(pages) → tx_df (many rows)
   - footer.parse_footer_from_pages(pages)       → footer_df (0 or 1 row)
 
@@ -71,7 +71,7 @@ def parse_kaspi_pay_statement(jsonl_path: str) -> Tuple[pd.DataFrame, pd.DataFra
 
     # 1) HEADER — from first page
     first_page = pages[0]
-    header_df = parse_header_page(first_page)
+    header_df = pd.DataFrame([parse_header_page(first_page)])
 
     # 2) TRANSACTIONS — from all pages
     tx_df = parse_transactions_from_pages(pages)
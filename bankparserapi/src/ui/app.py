@@ -25,6 +25,45 @@ if str(PROJECT_ROOT) not in sys.path:
 # -----------------------------
 # Helpers
 # -----------------------------
+_RE_BIN = re.compile(r"(\d{12})")
+_RE_CP_SPLIT = re.compile(r"БИН|ИИН|\n")
+_TXN_DATE_FORMATS = ("%d.%m.%Y", "%d.%m.%Y %H:%M:%S", "%d.%m.%Y %H:%M")
+
+# Built once per process rather than on every Streamlit rerun / format_func call.
+_BANK_LABELS: Dict[str, str] = {
+    "kaspi_gold": "Kaspi Gold",
+    "kaspi_pay": "Kaspi Pay",
+    "halyk_business": "Halyk (Business)",
+    "halyk_individual": "Halyk (Individual)",
+    "freedom_bank": "Freedom Bank",
+    "forte_bank": "ForteBank",
+    "eurasian_bank": "Eurasian Bank",
+    "bcc_bank": "BCC (CenterCredit)",
+    "alatau_city_bank": "Alatau City Bank",
+}
+
+# Переименование колонок на русский
+_ENRICHED_COLUMN_LABELS: Dict[str, str] = {
+    'bank': 'Банк',
+    'account_number': 'Номер счета',
+    'source_pdf': 'Источник PDF',
+    'ip_knp_norm': 'КНП (норм)',
+    'ip_op_date': 'Дата операции (IP)',
+    'ip_is_non_business_by_knp': 'Не бизнес (по КНП)',
+    'ip_is_non_business_by_keywords': 'Не бизнес (по ключевым словам)',
+    'ip_is_non_business': 'Не бизнес',
+    'ip_is_business_income': 'Бизнес-доход',
+    'ip_credit_amount': 'Сумма бизнес-дохода',
+    'txn_date': 'Дата транзакции'
+}
+_TX_COLUMN_LABELS: Dict[str, str] = {
+    'bank': 'Банк',
+    'account_number': 'Номер счета',
+    'source_pdf': 'Источник PDF',
+    'txn_date': 'Дата транзакции'
+}
+
+
 def init_session_state() -> None:
     if "client_name" not in st.session_state:
         st.session_state.client_name = ""
@@ -39,17 +78,25 @@ def init_session_state() -> None:
 
 
 def _format_bank_label(bank_key: str) -> str:
-    return {
-        "kaspi_gold": "Kaspi Gold",
-        "kaspi_pay": "Kaspi Pay",
-        "halyk_business": "Halyk (Business)",
-        "halyk_individual": "Halyk (Individual)",
-        "freedom_bank": "Freedom Bank",
-        "forte_bank": "ForteBank",
-        "eurasian_bank": "Eurasian Bank",
-        "bcc_bank": "BCC (CenterCredit)",
-        "alatau_city_bank": "Alatau City Bank",
-    }.get(bank_key, bank_key)
+    return _BANK_LABELS.get(bank_key, bank_key)
+
+
+def parse_dates_dayfirst(s: pd.Series) -> pd.Series:
+    """
+    pd.to_datetime(s, errors="coerce", dayfirst=True), but statement dates are
+    tried against the usual DD.MM.YYYY layouts first (fast, cached per unique
+    value); only values matching neither go through the per-value dateutil path.
+    """
+    parsed = pd.to_datetime(s, format=_TXN_DATE_FORMATS[0], errors="coerce", cache=True)
+    for fmt in _TXN_DATE_FORMATS[1:]:
+        rest = parsed.isna() & s.notna()
+        if not rest.any():
+            return parsed
+        parsed = parsed.fillna(pd.to_datetime(s[rest], format=fmt, errors="coerce", cache=True))
+    rest = parsed.isna() & s.notna()
+    if rest.any():
+        parsed = parsed.fillna(pd.to_datetime(s[rest], errors="coerce", dayfirst=True))
+    return parsed
 
 
 def ensure_txn_date(statement) -> None:
@@ -59,7 +106,7 @@ def ensure_txn_date(statement) -> None:
 
     if "txn_date" in df.columns:
         if not pd.api.types.is_datetime64_any_dtype(df["txn_date"]):
-            df["txn_date"] = pd.to_datetime(df["txn_date"], errors="coerce", dayfirst=True)
+            df["txn_date"] = parse_dates_dayfirst(df["txn_date"])
     else:
         from src.core.ip_config import IP_INCOME_CONFIG
         cfg = IP_INCOME_CONFIG.get(getattr(statement, "bank", ""), {})
@@ -67,7 +114,7 @@ def ensure_txn_date(statement) -> None:
         candidates = [date_col, "Дата", "date", "Дата операции", "Дата проводки", "txn_date"]
         candidates = [c for c in candidates if c and c in df.columns]
         if candidates:
-            df["txn_date"] = pd.to_datetime(df[candidates[0]], errors="coerce", dayfirst=True)
+            df["txn_date"] = parse_dates_dayfirst(df[candidates[0]])
         else:
             # Если не нашли колонку с датой, создаем txn_date с сегодняшней датой
             df["txn_date"] = pd.Timestamp(date.today())
@@ -76,6 +123,94 @@ def ensure_txn_date(statement) -> None:
     statement.tx_df = df
 
 
+def clean_amt_series(s: pd.Series) -> pd.Series:
+    """
+    Amount column -> float Series: commas and (NBSP) spaces removed,
+    empty / unparsable values -> 0.0.
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float).fillna(0.0)
+    cleaned = s.astype(str).str.replace(r"[,\s\u00A0\u202F]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").fillna(0.0)
+
+
+def extract_counterparties(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """
+    (counterparty_id, counterparty_name) for every row of df.
+
+    Counterparty text is the first non-null of 'Контрагент', 'Контрагент (имя)',
+    'Корреспондент', 'Наименование получателя'. If it holds a 12-digit БИН/ИИН,
+    id is that number and name is the text before 'БИН'/'ИИН'/newline (or the
+    number itself). Otherwise both are the first line of the text, or
+    df['details'] / 'Н/Д' when there is no counterparty text at all.
+    """
+    cp_cols = [c for c in ['Контрагент', 'Контрагент (имя)', 'Корреспондент', 'Наименование получателя']
+               if c in df.columns]
+    # coalesce right-to-left, keeping each column's own values (no float upcast of ids)
+    cp_text = pd.Series("", index=df.index, dtype=object)
+    for col in reversed(cp_cols):
+        cp_text = df[col].astype(object).where(df[col].notna(), cp_text)
+    cp_text = cp_text.astype(str)
+
+    bin_ser = cp_text.str.extract(_RE_BIN, expand=False)
+    has_bin = bin_ser.notna()
+
+    # Имя при найденном БИН: текст до слова БИН/ИИН или первая строка
+    bin_name = cp_text.str.split(_RE_CP_SPLIT, n=1).str[0].str.strip()
+    bin_name = bin_name.where(bin_name.ne(""), bin_ser)
+
+    # БИН не найден: первая строка текста, иначе details / 'Н/Д'
+    if "details" in df.columns:
+        details = df["details"]
+        details_fb = details.where(details.astype(bool), "Н/Д").astype(str)
+    else:
+        details_fb = pd.Series("Н/Д", index=df.index)
+    first_line = cp_text.str.split("\n", n=1).str[0].str.strip()
+    fallback = first_line.where(cp_text.ne(""), details_fb)
+
+    return bin_ser.where(has_bin, fallback), bin_name.where(has_bin, fallback)
+
+
+# Streamlit reruns the whole script on every widget interaction. The heavy
+# per-statement work is memoized per session (st.session_state, never shared
+# between users) on the identity of the parsed statement objects + window:
+# a re-uploaded file is a new object and is recomputed. The statements are
+# kept in the entry so their id() cannot be reused while it is cached.
+_MEMO_MAX_ENTRIES = 32
+
+
+def _session_memo(name: str, statements: tuple, params: tuple, compute):
+    memo: Dict[tuple, tuple] = st.session_state.setdefault(name, {})
+    key = (tuple(id(s) for s in statements), params)
+    hit = memo.get(key)
+    if hit is not None and all(a is b for a, b in zip(hit[0], statements)):
+        return hit[1]
+    value = compute()
+    memo[key] = (statements, value)
+    while len(memo) > _MEMO_MAX_ENTRIES:
+        memo.pop(next(iter(memo)))
+    return value
+
+
+def _cached_enriched(statement, window_start: date, window_end: date) -> Optional[pd.DataFrame]:
+    from src.core.analysis import compute_ip_income_for_statement
+
+    def compute():
+        df_en, _ = compute_ip_income_for_statement(statement, window_start, window_end)
+        return df_en
+
+    return _session_memo("_memo_enriched", (statement,), (window_start, window_end), compute)
+
+
+def _cached_combined(statements, window_start: date, window_end: date,
+                     filter_by_date: bool) -> pd.DataFrame:
+    from src.core.analysis import combine_transactions
+    return _session_memo(
+        "_memo_combined", tuple(statements), (window_start, window_end, filter_by_date),
+        lambda: combine_transactions(statements, window_start, window_end, filter_by_date=filter_by_date),
+    )
+
+
 def build_metadata_df(statements) -> pd.DataFrame:
     if not statements: return pd.DataFrame()
     rows = []
@@ -113,9 +248,7 @@ def main() -> None:
     st.header("2. Загрузка выписок")
     col_bank, col_file = st.columns([1, 3])
     with col_bank:
-        bank_key = st.selectbox("Банк", options=["kaspi_gold", "kaspi_pay", "halyk_business", "halyk_individual",
-                                                 "freedom_bank", "forte_bank", "eurasian_bank", "bcc_bank",
-                                                 "alatau_city_bank"], format_func=_format_bank_label)
+        bank_key = st.selectbox("Банк", options=list(_BANK_LABELS), format_func=_format_bank_label)
     with col_file:
         uploaded_file = st.file_uploader("Загрузить PDF", type=["pdf"])
 
@@ -137,7 +270,6 @@ def main() -> None:
 
     # --- Step 4: UI Analysis Tables ---
     st.header("4. Аналитические таблицы (Топ-9 и Аффилированные лица)")
-    from src.core.analysis import combine_transactions
     
     # Чекбокс для выбора - учитывать даты или нет
     if "filter_by_date" not in st.session_state:
@@ -159,34 +291,24 @@ def main() -> None:
     else:
         st.info("📅 Фильтрация по датам выключена. Учитываются все транзакции.")
     
-    tx_12m = combine_transactions(st.session_state.statements, window_start, window_end, filter_by_date=filter_by_date)
+    tx_12m = _cached_combined(st.session_state.statements, window_start, window_end, filter_by_date)
 
     if not tx_12m.empty:
         from src.ui.ui_analysis_report_generator import get_ui_analysis_tables
         # Работаем с копией для аналитики, чтобы не портить tx_12m для отображения в конце
         df_analysis = tx_12m.copy()
 
-        # 1. ЧИСТКА СУММ (обработка запятых и спец-пробелов)
-        def clean_amt_val(v):
-            if pd.isna(v) or v == '': return 0.0
-            if isinstance(v, (int, float)): return float(v)
-            s = str(v).replace(',', '').replace(' ', '').replace('\xa0', '').replace('\u00A0', '').strip()
-            try:
-                return float(s)
-            except:
-                return 0.0
-
-        # 2. ОПРЕДЕЛЕНИЕ СУММЫ (amount)
+        # 1-2. ОПРЕДЕЛЕНИЕ СУММЫ (amount), чистка через clean_amt_series
         # Если есть Дебет и Кредит (Halyk Business / Kaspi Pay)
         if 'Дебет' in df_analysis.columns and 'Кредит' in df_analysis.columns:
-            d_clean = df_analysis['Дебет'].apply(clean_amt_val)
-            k_clean = df_analysis['Кредит'].apply(clean_amt_val)
+            d_clean = clean_amt_series(df_analysis['Дебет'])
+            k_clean = clean_amt_series(df_analysis['Кредит'])
             df_analysis['amount'] = k_clean - d_clean
         elif 'amount' not in df_analysis.columns:
             amt_col = next((c for c in ['Сумма операции', 'Сумма', 'Расход', 'Кредит'] if c in df_analysis.columns),
                            None)
             if amt_col:
-                df_analysis['amount'] = df_analysis[amt_col].apply(clean_amt_val)
+                df_analysis['amount'] = clean_amt_series(df_analysis[amt_col])
             else:
                 df_analysis['amount'] = 0.0
 
@@ -194,33 +316,13 @@ def main() -> None:
         desc_col = next(
             (c for c in ['Детали платежа', 'Описание операции', 'details', 'Назначение платежа', 'operation'] if
              c in df_analysis.columns), None)
-        df_analysis['details'] = df_analysis[desc_col].fillna('') if desc_col else ''
+        # string dtype: compact and fast for the .str lookups downstream; with no
+        # description column 'details' is simply absent (treated as '' downstream)
+        if desc_col:
+            df_analysis['details'] = df_analysis[desc_col].fillna('').astype('string')
 
         # 4. ОПРЕДЕЛЕНИЕ КОНТРАГЕНТА (counterparty_id = БИН)
-        def get_cp_data(row):
-            # Список колонок, где может быть имя/БИН контрагента
-            cp_candidates = ['Контрагент', 'Контрагент (имя)', 'Корреспондент', 'Наименование получателя']
-            cp_text = ""
-            for col in cp_candidates:
-                if col in row and pd.notna(row[col]):
-                    cp_text = str(row[col])
-                    break
-
-            # Ищем БИН (12 цифр подряд)
-            bin_match = re.search(r'(\d{12})', cp_text)
-            if bin_match:
-                bin_val = bin_match.group(1)
-                # Имя: берем текст до слова БИН или первую строку
-                name = cp_text.split('БИН')[0].split('ИИН')[0].split('\n')[0].strip()
-                return bin_val, (name if name else bin_val)
-
-            # Если БИН не найден
-            name_fallback = cp_text.split('\n')[0].strip() if cp_text else (row.get('details') or 'Н/Д')
-            return str(name_fallback), str(name_fallback)
-
-        cp_results = df_analysis.apply(get_cp_data, axis=1)
-        df_analysis['counterparty_id'] = [x[0] for x in cp_results]
-        df_analysis['counterparty_name'] = [x[1] for x in cp_results]
+        df_analysis['counterparty_id'], df_analysis['counterparty_name'] = extract_counterparties(df_analysis)
 
         # ГЕНЕРАЦИЯ ТАБЛИЦ
         analysis = get_ui_analysis_tables(df_analysis)
@@ -249,31 +351,15 @@ def main() -> None:
     st.header("5. Транзакции с флагами IP (Анализ дохода ИП)")
     enriched_list = []
     for s in st.session_state.statements:
-        from src.core.analysis import compute_ip_income_for_statement
-        df_en, _ = compute_ip_income_for_statement(s, window_start, window_end)
+        df_en = _cached_enriched(s, window_start, window_end)
         if df_en is not None:
             enriched_list.append(df_en)
 
     if enriched_list:
         all_enriched = pd.concat(enriched_list, ignore_index=True)
         
-        # Переименование колонок на русский
-        column_mapping = {
-            'bank': 'Банк',
-            'account_number': 'Номер счета',
-            'source_pdf': 'Источник PDF',
-            'ip_knp_norm': 'КНП (норм)',
-            'ip_op_date': 'Дата операции (IP)',
-            'ip_is_non_business_by_knp': 'Не бизнес (по КНП)',
-            'ip_is_non_business_by_keywords': 'Не бизнес (по ключевым словам)',
-            'ip_is_non_business': 'Не бизнес',
-            'ip_is_business_income': 'Бизнес-доход',
-            'ip_credit_amount': 'Сумма бизнес-дохода',
-            'txn_date': 'Дата транзакции'
-        }
-        
         # Переименовываем только существующие колонки
-        display_df = all_enriched.rename(columns={k: v for k, v in column_mapping.items() if k in all_enriched.columns})
+        display_df = all_enriched.rename(columns={k: v for k, v in _ENRICHED_COLUMN_LABELS.items() if k in all_enriched.columns})
         st.dataframe(display_df, use_container_width=True)
     else:
         st.info("Транзакции бизнес-дохода не найдены.")
@@ -282,13 +368,7 @@ def main() -> None:
         # Здесь показываем оригинальный tx_12m, чтобы видеть все колонки из PDF
         # Переименовываем стандартные колонки на русский, если они есть
         tx_display = tx_12m.copy()
-        tx_column_mapping = {
-            'bank': 'Банк',
-            'account_number': 'Номер счета',
-            'source_pdf': 'Источник PDF',
-            'txn_date': 'Дата транзакции'
-        }
-        tx_display = tx_display.rename(columns={k: v for k, v in tx_column_mapping.items() if k in tx_display.columns})
+        tx_display = tx_display.rename(columns={k: v for k, v in _TX_COLUMN_LABELS.items() if k in tx_display.columns})
         st.dataframe(tx_display, use_container_width=True)
 
 
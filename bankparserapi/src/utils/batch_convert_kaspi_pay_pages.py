@@ -8,11 +8,15 @@ Batch-конвертер для Kaspi Pay:
     DATA_DIR / "converted_jsons" / "kaspi_pay"
 """
 
+import gc
+import os
 import sys
+from itertools import islice
 from pathlib import Path
+from typing import List, Optional, Tuple
 import argparse
 
-from src.utils.convert_pdf_json_pages import dump_pdf_pages, DATA_DIR
+from src.utils.batch_jobs import run_jobs
 
 
 def parse_args() -> argparse.Namespace:
@@ -37,38 +41,67 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional limit on number of PDFs to process (for testing).",
     )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count). 1 = sequential.",
+    )
     return ap.parse_args()
 
 
+ConvertResult = Tuple[Path, Optional[Path], Optional[str]]  # (pdf, written, error)
+
+
+def _convert_one(job: Tuple[Path, Path]) -> ConvertResult:
+    # top-level so it can be pickled for the process pool; the converter (and the
+    # PDF libs behind it) is imported lazily so --help stays fast. Files are
+    # already spread over processes here, so pages are extracted sequentially.
+    from src.utils.convert_pdf_json_pages import dump_pdf_pages
+
+    pdf_path, out_path = job
+    try:
+        return pdf_path, dump_pdf_pages(pdf_path=pdf_path, out_path=out_path, page_workers=1), None
+    except Exception as e:
+        return pdf_path, None, str(e)
+    finally:
+        # drop pdfplumber/pikepdf object trees before the next file
+        gc.collect()
+
+
+def _list_pdf_paths(root: Path, pattern: str, max_files: Optional[int]) -> List[Path]:
+    """Matching PDFs in sorted order, so --max-files always picks the same subset."""
+    return list(islice(sorted(root.rglob(pattern)), max_files))
+
+
 def main() -> None:
     args = parse_args()
 
+    from src.utils.convert_pdf_json_pages import DATA_DIR
+
     root = Path(args.root)
     if not root.is_dir():
         raise SystemExit(f"Root is not a directory: {root}")
 
-    pdf_paths = sorted(root.rglob(args.pattern))
+    pdf_paths = _list_pdf_paths(root, args.pattern, args.max_files)
     if not pdf_paths:
         print(f"⚠️ No PDFs found in {root} (pattern={args.pattern})")
         return
 
-    if args.max_files is not None:
-        pdf_paths = pdf_paths[: args.max_files]
-
     out_dir = DATA_DIR / "converted_jsons" / "kaspi_pay"
     out_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"Found {len(pdf_paths)} PDF file(s) under {root}")
     print(f"JSONL will be written to: {out_dir}")
 
-    for i, pdf_path in enumerate(pdf_paths, start=1):
-        try:
-            print(f"\n[{i}/{len(pdf_paths)}] Processing: {pdf_path}")
-            out_path = out_dir / f"{pdf_path.stem}_pages.jsonl"
-            written = dump_pdf_pages(pdf_path=pdf_path, out_path=out_path)
+    jobs = [(pdf_path, out_dir / f"{pdf_path.stem}_pages.jsonl") for pdf_path in pdf_paths]
+    total = len(pdf_paths)
+    for i, (pdf_path, written, err) in enumerate(run_jobs(jobs, _convert_one, args.workers), start=1):
+        print(f"\n[{i}/{total}] Processed: {pdf_path}")
+        if err is None:
             print(f"   → Written: {written}")
-        except Exception as e:
-            print(f"   ❌ Failed for {pdf_path}: {e}", file=sys.stderr)
+        else:
+            print(f"   ❌ Failed for {pdf_path}: {err}", file=sys.stderr)
 
 
 if __name__ == "__main__":
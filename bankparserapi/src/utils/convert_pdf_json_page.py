@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
-import sys, json, base64, argparse
-from typing import Any, Dict, Set, Tuple
+from __future__ import annotations
+
+import os, sys, json, base64, argparse
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Set, Tuple
 from pathlib import Path
 
-import pikepdf
-from pikepdf import Name, Dictionary, Array, Stream, Object
+# pikepdf is imported on first use (see _require_pikepdf) so `--help`,
+# argparse errors and importers of this module don't pay for it up front.
+pikepdf = None
+Name = Dictionary = Array = Stream = Object = None
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
 from src.config import DATA_DIR, FAILED
 
 
@@ -20,6 +28,19 @@ from src.config import DATA_DIR, FAILED
 
 # --- Helpers ---------------------------------------------------------------
 
+def _require_pikepdf() -> None:
+    global pikepdf, Name, Dictionary, Array, Stream, Object
+    if pikepdf is None:
+        import pikepdf
+        from pikepdf import Name, Dictionary, Array, Stream, Object
+        object_type = getattr(pikepdf, "ObjectType", None)
+        if object_type is not None:
+            for member, handler in (("dictionary", _dictionary_to_json), ("array", _array_to_json),
+                                    ("name_", _name_to_json), ("stream", _stream_to_json)):
+                code = getattr(object_type, member, None)
+                if code is not None:
+                    _TYPE_HANDLERS[code] = handler
+
 def name_str(n: Name) -> str:
     try:
         return str(n)
@@ -39,6 +60,33 @@ def obj_id(obj: Object) -> str:
         pass
     return f"direct:{id(obj)}"
 
+# /Type (or XObject /Subtype) of the indirect objects worth caching: resources
+# shared between pages. Pages, page trees and content streams are never cached,
+# so the cache stays bounded by the number of distinct shared resources.
+_SHARED_RESOURCE_TYPES = frozenset({
+    "/Font", "/FontDescriptor", "/XObject", "/ExtGState", "/Pattern", "/Shading",
+    "/Image", "/Form",
+})
+
+def _is_shared_resource(obj: Any) -> bool:
+    try:
+        for key in ("/Type", "/Subtype"):
+            t = obj.get(key)
+            if t is not None and name_str(t) in _SHARED_RESOURCE_TYPES:
+                return True
+    except Exception:
+        pass
+    return False
+
+def indirect_id(obj: Any) -> Optional[str]:
+    """obj_id() for indirect objects only; None for direct objects and non-pikepdf values."""
+    try:
+        if obj.is_indirect:
+            return obj_id(obj)
+    except Exception:
+        pass
+    return None
+
 def safe_bytes_preview(b: bytes, max_bytes: int) -> Dict[str, Any]:
     preview = b[:max_bytes]
     return {
@@ -56,10 +104,16 @@ def to_jsonable(obj: Any,
                 depth: int,
                 max_depth: int,
                 include_stream_data: bool,
-                stream_max_bytes: int) -> Any:
+                stream_max_bytes: int,
+                cache: Optional[Dict[Tuple[str, int], Any]] = None) -> Any:
     """
     Recursively convert pikepdf objects to JSON-serializable structures.
     Guards against cycles and huge streams.
+    If `cache` is given, each indirect shared resource (fonts, images,
+    XObjects, ExtGState, ...) is converted once per remaining depth and reused
+    wherever it is referenced again at that depth, so a reference reached near
+    max_depth never truncates a shallower one. Top-level results, pages and
+    content streams are not cached.
     """
     if depth > max_depth:
         return {"__type__": "DepthLimit", "note": f"max_depth {max_depth} reached"}
@@ -68,43 +122,77 @@ def to_jsonable(obj: Any,
     if obj is None or isinstance(obj, (bool, int, float, str)):
         return obj
 
-    # Names
-    if isinstance(obj, Name):
-        return {"__type__": "Name", "value": name_str(obj)}
-
-    # Arrays
-    if isinstance(obj, Array):
-        return [
-            to_jsonable(x, seen, depth + 1, max_depth, include_stream_data, stream_max_bytes)
-            for x in obj
-        ]
-
-    # Dictionaries
-    if isinstance(obj, Dictionary):
-        out = {"__type__": "Dictionary"}
-        for k, v in obj.items():
-            key = name_str(k) if isinstance(k, Name) else str(k)
-            out[key] = to_jsonable(v, seen, depth + 1, max_depth, include_stream_data, stream_max_bytes)
-        return out
-
-    # Streams
-    if isinstance(obj, Stream):
-        d: Dict[str, Any] = {"__type__": "Stream"}
-        # Include stream dictionary (metadata)
+    oid = indirect_id(obj) if cache is not None and depth > 0 else None
+    if oid is None or not _is_shared_resource(obj):
+        return _convert_node(obj, seen, depth, max_depth, include_stream_data, stream_max_bytes, cache)
+    key = (oid, max_depth - depth)
+    if key in cache:
+        return cache[key]
+    res = _convert_node(obj, seen, depth, max_depth, include_stream_data, stream_max_bytes, cache)
+    # a cycle marker only holds for the traversal that produced it
+    if not (isinstance(res, dict) and res.get("__type__") == "Ref"):
+        cache[key] = res
+    return res
+
+def _name_to_json(obj, seen, depth, max_depth, include_stream_data, stream_max_bytes, cache) -> Any:
+    return {"__type__": "Name", "value": name_str(obj)}
+
+def _array_to_json(obj, seen, depth, max_depth, include_stream_data, stream_max_bytes, cache) -> Any:
+    return [
+        to_jsonable(x, seen, depth + 1, max_depth, include_stream_data, stream_max_bytes, cache)
+        for x in obj
+    ]
+
+def _dictionary_to_json(obj, seen, depth, max_depth, include_stream_data, stream_max_bytes, cache) -> Any:
+    out = {"__type__": "Dictionary"}
+    for k, v in obj.items():
+        key = name_str(k) if isinstance(k, Name) else str(k)
+        out[key] = to_jsonable(v, seen, depth + 1, max_depth, include_stream_data, stream_max_bytes, cache)
+    return out
+
+def _stream_to_json(obj, seen, depth, max_depth, include_stream_data, stream_max_bytes, cache) -> Any:
+    d: Dict[str, Any] = {"__type__": "Stream"}
+    # Include stream dictionary (metadata)
+    try:
+        d["dict"] = to_jsonable(obj._dict, seen, depth + 1, max_depth, include_stream_data, stream_max_bytes, cache)
+    except Exception as e:
+        d["dict_error"] = f"{type(e).__name__}: {e}"
+
+    # Optionally include decoded data preview
+    if include_stream_data:
         try:
-            d["dict"] = to_jsonable(obj._dict, seen, depth + 1, max_depth, include_stream_data, stream_max_bytes)
+            # decode filters if possible
+            data = obj.read_bytes()
+            d["data"] = safe_bytes_preview(data, stream_max_bytes)
         except Exception as e:
-            d["dict_error"] = f"{type(e).__name__}: {e}"
-
-        # Optionally include decoded data preview
-        if include_stream_data:
-            try:
-                # decode filters if possible
-                data = obj.read_bytes()
-                d["data"] = safe_bytes_preview(data, stream_max_bytes)
-            except Exception as e:
-                d["data_error"] = f"{type(e).__name__}: {e}"
-        return d
+            d["data_error"] = f"{type(e).__name__}: {e}"
+    return d
+
+# pikepdf.ObjectType -> converter, filled by _require_pikepdf(). pikepdf objects
+# are all instances of one class (isinstance goes through a metaclass check on
+# the type code), so one dict lookup replaces the isinstance cascade.
+_TYPE_HANDLERS: Dict[Any, Any] = {}
+
+def _convert_node(obj: Any,
+                  seen: Set[str],
+                  depth: int,
+                  max_depth: int,
+                  include_stream_data: bool,
+                  stream_max_bytes: int,
+                  cache: Optional[Dict[str, Any]]) -> Any:
+    handler = _TYPE_HANDLERS.get(getattr(obj, "_type_code", None))
+    if handler is None:
+        # no type code to dispatch on – classify the slow way
+        if isinstance(obj, Dictionary):
+            handler = _dictionary_to_json
+        elif isinstance(obj, Array):
+            handler = _array_to_json
+        elif isinstance(obj, Name):
+            handler = _name_to_json
+        elif isinstance(obj, Stream):
+            handler = _stream_to_json
+    if handler is not None:
+        return handler(obj, seen, depth, max_depth, include_stream_data, stream_max_bytes, cache)
 
     # Indirect objects – dereference and guard cycles
     if isinstance(obj, Object):
@@ -119,7 +207,7 @@ def to_jsonable(obj: Any,
         return {
             "__type__": "Indirect",
             "id": oid,
-            "value": to_jsonable(deref, seen, depth + 1, max_depth, include_stream_data, stream_max_bytes),
+            "value": to_jsonable(deref, seen, depth + 1, max_depth, include_stream_data, stream_max_bytes, cache),
         }
 
     # Fallback – stringify
@@ -127,18 +215,25 @@ def to_jsonable(obj: Any,
 
 # --- Entry points ----------------------------------------------------------
 
+def _convert(obj: Any, kw: Dict[str, Any]) -> Any:
+    # `seen` (cycle guard) is per traversal; `cache` may be shared across the
+    # catalog and all pages (see main())
+    return to_jsonable(obj, set(), 0, kw["max_depth"],
+                       kw["include_streams"], kw["stream_max_bytes"], kw.get("cache"))
+
 def dump_catalog(pdf: pikepdf.Pdf, **kw) -> Dict[str, Any]:
+    _require_pikepdf()
     root = pdf.Root
     info = {
         "pdf_version": pdf.pdf_version,
         "trailer_keys": list(pdf.trailer.keys()),
         "metadata": {k: str(v) for k, v in (pdf.docinfo or {}).items()},
-        "Root": to_jsonable(root, set(), 0, kw["max_depth"], kw["include_streams"], kw["stream_max_bytes"]),
+        "Root": _convert(root, kw),
     }
     return info
 
-def dump_pages(pdf: pikepdf.Pdf, **kw) -> Dict[str, Any]:
-    pages_out = []
+def iter_pages(pdf: pikepdf.Pdf, **kw) -> Iterator[Dict[str, Any]]:
+    _require_pikepdf()
     for i, page in enumerate(pdf.pages, start=1):
         page_obj = page.obj
         entry = {
@@ -146,13 +241,50 @@ def dump_pages(pdf: pikepdf.Pdf, **kw) -> Dict[str, Any]:
             "obj_id": obj_id(page_obj),
             "MediaBox": list(page_obj.get("/MediaBox", [])) if isinstance(page_obj.get("/MediaBox", []), Array) else page_obj.get("/MediaBox", None),
             "Rotate": int(page_obj.get("/Rotate", 0)),
-            "Resources": to_jsonable(page_obj.get("/Resources", Dictionary()), set(), 0, kw["max_depth"], kw["include_streams"], kw["stream_max_bytes"]),
+            "Resources": _convert(page_obj.get("/Resources", Dictionary()), kw),
         }
         # Contents can be a single stream or an array of streams
         contents = page_obj.get("/Contents", None)
-        entry["Contents"] = to_jsonable(contents, set(), 0, kw["max_depth"], kw["include_streams"], kw["stream_max_bytes"])
-        pages_out.append(entry)
-    return {"Pages": pages_out}
+        entry["Contents"] = _convert(contents, kw)
+        yield entry
+
+def dump_pages(pdf: pikepdf.Pdf, **kw) -> Dict[str, Any]:
+    return {"Pages": list(iter_pages(pdf, **kw))}
+
+def _dumps_indented(value: Any) -> bytes:
+    # orjson is much faster on big catalogs; stdlib json stays as the fallback
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # e.g. ints beyond 64 bit
+            pass
+    return json.dumps(value, ensure_ascii=False, indent=2).encode("utf-8")
+
+def _dumps_nested(value: Any, level: int) -> bytes:
+    # same layout as json.dump(indent=2) for a value nested `level` spaces deep
+    return _dumps_indented(value).replace(b"\n", b"\n" + b" " * level)
+
+def write_json_streamed(f: IO[bytes], fields: Iterable[Tuple[str, Any]]) -> None:
+    """
+    Write a top-level JSON object field by field (same layout as json.dump(indent=2)).
+    Iterator values are written as arrays element by element, so e.g. the per-page
+    entries never have to be held in memory all at once.
+    """
+    n_fields = 0
+    f.write(b"{")
+    for key, value in fields:
+        f.write((b"," if n_fields else b"") + b"\n  " + json.dumps(key, ensure_ascii=False).encode("utf-8") + b": ")
+        n_fields += 1
+        if isinstance(value, Iterator):
+            n_items = 0
+            f.write(b"[")
+            for item in value:
+                f.write((b"," if n_items else b"") + b"\n    " + _dumps_nested(item, 4))
+                n_items += 1
+            f.write(b"\n  ]" if n_items else b"]")
+        else:
+            f.write(_dumps_nested(value, 2))
+    f.write(b"\n}" if n_fields else b"}")
 
 def main():
     ap = argparse.ArgumentParser(description="Dump a PDF's internal objects to JSON (catalog, pages, resources, streams).")
@@ -165,6 +297,7 @@ def main():
     ap.add_argument("--include-xref", action="store_true", help="Also list the cross-reference (object numbers)")
     args = ap.parse_args()
 
+    _require_pikepdf()
     from src.utils.path_security import sanitize_filename, validate_path_for_write
     in_path = Path(args.pdf)
     out_dir = Path(DATA_DIR) / "converted_jsons"
@@ -176,37 +309,48 @@ def main():
         safe_stem = sanitize_filename(in_path.stem)
         out_path = out_dir / f"{safe_stem}.json"
 
-    with pikepdf.open(str(in_path)) as pdf:
-        out: Dict[str, Any] = {
-            "file": str(in_path),
-            "num_pages": len(pdf.pages),
-        }
+    validated = validate_path_for_write(out_path, out_dir if not args.out else _PROJECT_ROOT)
+    kw = dict(max_depth=args.max_depth,
+              include_streams=args.include_streams,
+              stream_max_bytes=args.stream_max_bytes,
+              # shared across catalog + pages so common resources are converted once
+              cache={})
 
-        out.update(dump_catalog(pdf,
-                                max_depth=args.max_depth,
-                                include_streams=args.include_streams,
-                                stream_max_bytes=args.stream_max_bytes))
-        out.update(dump_pages(pdf,
-                              max_depth=args.max_depth,
-                              include_streams=args.include_streams,
-                              stream_max_bytes=args.stream_max_bytes))
-
-        if args.include_xref:
-            xref = []
+    with pikepdf.open(str(in_path)) as pdf:
+        def fields() -> Iterator[Tuple[str, Any]]:
+            yield "file", str(in_path)
+            yield "num_pages", len(pdf.pages)
+            yield from dump_catalog(pdf, **kw).items()
+            # pages are converted and written one at a time
+            yield "Pages", iter_pages(pdf, **kw)
+            if args.include_xref:
+                xref = []
+                try:
+                    for obj in pdf.objects:
+                        try:
+                            og = obj.objgen
+                            xref.append({"obj": og[0], "gen": og[1], "type": type(obj.get_object()).__name__})
+                        except Exception:
+                            pass
+                except Exception as e:
+                    xref = {"error": f"{type(e).__name__}: {e}"}
+                yield "XRef", xref
+
+        # streamed into a temp file next to the output and moved into place on
+        # success, so a failure part-way never leaves a half-written JSON document
+        tmp = validate_path_for_write(
+            validated.with_name(f".{validated.name}.{os.getpid()}.tmp"), validated.parent
+        )
+        try:
+            with open(tmp, "wb") as f:
+                write_json_streamed(f, fields())
+            os.replace(tmp, validated)
+        except BaseException:
             try:
-                for obj in pdf.objects:
-                    try:
-                        og = obj.objgen
-                        xref.append({"obj": og[0], "gen": og[1], "type": type(obj.get_object()).__name__})
-                    except Exception:
-                        pass
-            except Exception as e:
-                xref = {"error": f"{type(e).__name__}: {e}"}
-            out["XRef"] = xref
-
-    validated = validate_path_for_write(out_path, out_dir if not args.out else _PROJECT_ROOT)
-    with open(validated, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
 
     print(f"Dumped to {out_path}")
 
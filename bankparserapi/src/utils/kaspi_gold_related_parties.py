@@ -36,6 +36,21 @@ FULL_NAME_RE = re.compile(
     rf"({WORD}(?:\s+{WORD})?\s+[{CYR_UP}]\.)"
 )
 
+# Cheap pre-check: every FULL_NAME_RE match ends with a capital initial + "."
+NAME_INITIAL_RE = re.compile(rf"[{CYR_UP}]\.")
+
+_EMPTY_SUMMARY_COLUMNS = [
+    "person_name",
+    "incoming_total",
+    "outgoing_total",
+    "total_amount",
+    "incoming_count",
+    "outgoing_count",
+    "txn_count",
+    "begin_date",
+    "end_date",
+]
+
 
 def _extract_person_name_from_details(details: object) -> Optional[str]:
     """
@@ -51,6 +66,16 @@ def _extract_person_name_from_details(details: object) -> Optional[str]:
     return m.group(1).strip()
 
 
+def extract_person_names(details: pd.Series) -> pd.Series:
+    """
+    Vectorized _extract_person_name_from_details: the matched name per row
+    (object dtype), None where there is no match.
+    """
+    # the match starts with a letter and ends with ".", so there is nothing to strip
+    names = details.astype("string").str.extract(FULL_NAME_RE, expand=False)
+    return names.astype(object).where(names.notna(), None)
+
+
 def summarize_kaspi_gold_persons(
     tx_df: pd.DataFrame,
     details_col: str = "details",
@@ -80,68 +105,75 @@ def summarize_kaspi_gold_persons(
     if amount_col not in tx_df.columns:
         raise ValueError(f"Column '{amount_col}' not found in tx_df")
 
-    df = tx_df.copy()
+    if date_col not in tx_df.columns and fallback_date_col not in tx_df.columns:
+        raise ValueError(
+            f"Neither '{date_col}' nor '{fallback_date_col}' found in tx_df"
+        )
+
+    # Only three columns are needed: work on Series and build one small frame at
+    # the end instead of copying the whole tx_df (and re-copying after each filter).
+
+    # --- keep only rows that can contain a name (initial + ".") ---
+
+    candidate = (
+        tx_df[details_col].astype("string")
+        .str.contains(NAME_INITIAL_RE, na=False)
+        .to_numpy(dtype=bool)
+    )
+    if not candidate.any():
+        return pd.DataFrame(columns=_EMPTY_SUMMARY_COLUMNS)
+    # positional boolean masks, so a non-unique tx_df index is handled too
+    details = tx_df[details_col][candidate]
+    amounts = tx_df[amount_col][candidate]
 
     # --- ensure date col exists and is datetime ---
 
-    if date_col not in df.columns:
-        if fallback_date_col not in df.columns:
-            raise ValueError(
-                f"Neither '{date_col}' nor '{fallback_date_col}' found in tx_df"
+    # cache=True: a statement has only O(days) distinct date strings, each parsed once
+    if date_col in tx_df.columns:
+        dates = tx_df[date_col][candidate]
+    else:
+        dates = tx_df[fallback_date_col][candidate]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(
+                dates.astype(str),
+                format=fallback_date_format,
+                errors="coerce",
+                cache=True,
             )
-        df[date_col] = pd.to_datetime(
-            df[fallback_date_col].astype(str),
-            format=fallback_date_format,
-            errors="coerce",
-        )
 
-    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-
-    df = df.dropna(subset=[date_col]).copy()
-    if df.empty:
-        return pd.DataFrame(
-            columns=[
-                "person_name",
-                "incoming_total",
-                "outgoing_total",
-                "total_amount",
-                "incoming_count",
-                "outgoing_count",
-                "txn_count",
-                "begin_date",
-                "end_date",
-            ]
-        )
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, errors="coerce", cache=True)
+
+    valid_date = dates.notna()
+    if not valid_date.any():
+        return pd.DataFrame(columns=_EMPTY_SUMMARY_COLUMNS)
 
     # --- extract person_name from details ---
 
-    df["person_name"] = df[details_col].apply(_extract_person_name_from_details)
-    df = df[~df["person_name"].isna()].copy()
-    if df.empty:
-        return pd.DataFrame(
-            columns=[
-                "person_name",
-                "incoming_total",
-                "outgoing_total",
-                "total_amount",
-                "incoming_count",
-                "outgoing_count",
-                "txn_count",
-                "begin_date",
-                "end_date",
-            ]
-        )
+    names = extract_person_names(details[valid_date])
+    has_name = names.notna()
+    if not has_name.any():
+        return pd.DataFrame(columns=_EMPTY_SUMMARY_COLUMNS)
 
     # --- numeric amount and incoming / outgoing splits ---
 
-    df["_amount_num"] = pd.to_numeric(df[amount_col], errors="coerce").fillna(0.0)
+    df = pd.DataFrame({
+        "person_name": names[has_name].array,
+        date_col: dates[valid_date][has_name].array,
+        "_amount_num": pd.to_numeric(amounts[valid_date][has_name], errors="coerce").fillna(0.0).array,
+    })
+
+    amt = df["_amount_num"].to_numpy()
 
     # incoming = credit (поступления на карту)
-    df["_incoming"] = df["_amount_num"].where(df["_amount_num"] > 0, 0.0)
+    df["_incoming"] = np.maximum(amt, 0)
 
     # outgoing = debit (списания с карты), берём модуль
-    df["_outgoing"] = -df["_amount_num"].where(df["_amount_num"] < 0, 0.0)
+    df["_outgoing"] = np.maximum(-amt, 0)
+
+    # flags for the counts, so the groupby stays on built-in (Cython) aggregations
+    df["_is_incoming"] = df["_amount_num"] > 0
+    df["_is_outgoing"] = df["_amount_num"] < 0
 
     # --- group by person_name ---
 
@@ -151,11 +183,11 @@ def summarize_kaspi_gold_persons(
             incoming_total=("_incoming", "sum"),
             outgoing_total=("_outgoing", "sum"),
             total_amount=("_amount_num", "sum"),
-            incoming_count=("_incoming", lambda s: (s > 0).sum()),
-            outgoing_count=("_outgoing", lambda s: (s > 0).sum()),
+            incoming_count=("_is_incoming", "sum"),
+            outgoing_count=("_is_outgoing", "sum"),
             begin_date=(date_col, "min"),
             end_date=(date_col, "max"),
-            txn_count=(date_col, "count"),
+            txn_count=(date_col, "size"),  # rows were filtered by the valid_date mask, so no NaT here
         )
         .reset_index()
     )
@@ -14,6 +14,21 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from src.db.database import DatabaseConnection, import_statement_to_db
 from src.db.config import DB_CONFIG
 
+# Identifier columns are read as text: skips type inference and keeps
+# leading zeros in IIN/BIN, account and document numbers.
+_HEADER_DTYPES = {"account": str, "currency": str, "client": str, "iin_bin": str}
+_TX_DTYPES = {
+    "Дебет": "float64",
+    "Кредит": "float64",
+    "Курс НБ РК": "float64",
+    "Эквивалент в тенге по курсу НБ РК": "float64",
+    "№ док": str,
+    "КНП": str,
+    "БИН/ИИН": str,
+    "БИК корр.": str,
+    "Счет": str,
+}
+
 def import_alatau_statement():
     """Import Alatau City Bank statement from CSV files"""
     
@@ -30,11 +45,11 @@ def import_alatau_statement():
     
     # Read CSV files
     try:
-        header_df = pd.read_csv(csv_dir / f"{stem}_header.csv")
-        tx_df = pd.read_csv(csv_dir / f"{stem}_tx.csv")
+        header_df = pd.read_csv(csv_dir / f"{stem}_header.csv", dtype=_HEADER_DTYPES)
+        tx_df = pd.read_csv(csv_dir / f"{stem}_tx.csv", dtype=_TX_DTYPES)
         footer_df = pd.read_csv(csv_dir / f"{stem}_footer.csv")
         meta_df = pd.read_csv(csv_dir / f"{stem}_meta.csv")
-        tx_ip_df = pd.read_csv(csv_dir / f"{stem}_tx_ip.csv")
+        tx_ip_df = pd.read_csv(csv_dir / f"{stem}_tx_ip.csv", dtype=_TX_DTYPES)
         monthly_df = pd.read_csv(csv_dir / f"{stem}_ip_income_monthly.csv")
         income_summary_df = pd.read_csv(csv_dir / f"{stem}_income_summary.csv")
         
@@ -67,36 +82,28 @@ def import_alatau_statement():
     try:
         db.connect()
         
-        # Clean up test data from previous runs - delete all transactions_ip_flags without statements
+        # Clean up test data from previous runs: ip flags -> transactions -> statements
+        # (the rest cascades), sent as one batch and committed once
         try:
-            db.execute_query("""
-                DELETE FROM transactions_ip_flags 
+            db.execute_command(
+                """
+                DELETE FROM transactions_ip_flags
                 WHERE transaction_id IN (
                     SELECT t.id FROM transactions t
                     WHERE t.statement_id IN (
-                        SELECT id FROM statements WHERE bank = 'Alatau City Bank'
+                        SELECT id FROM statements WHERE bank = %(bank)s
                     )
-                )
-            """)
-        except:
-            pass
-        
-        # Delete transactions
-        try:
-            db.execute_query("""
-                DELETE FROM transactions 
+                );
+                DELETE FROM transactions
                 WHERE statement_id IN (
-                    SELECT id FROM statements WHERE bank = 'Alatau City Bank'
-                )
-            """)
-        except:
-            pass
-        
-        # Delete statements (which cascades to other tables)
-        try:
-            db.execute_query("DELETE FROM statements WHERE bank = 'Alatau City Bank'")
-        except:
-            pass
+                    SELECT id FROM statements WHERE bank = %(bank)s
+                );
+                DELETE FROM statements WHERE bank = %(bank)s;
+                """,
+                {"bank": 'Alatau City Bank'},
+            )
+        except Exception as e:
+            print(f"⚠️  Cleanup skipped: {e}")
         
         # Import statement
         statement_id = import_statement_to_db(db, statement_data, 'Alatau City Bank')
@@ -7,12 +7,19 @@
 - UI для поиска налогоплательщика
 """
 
+import queue
 import subprocess
 import sys
+import threading
 import time
 import socket
 from pathlib import Path
 
+try:
+    import psutil  # optional: без него — connect_ex + lsof по каждому порту
+except ImportError:
+    psutil = None
+
 def run_api_server():
     """Запуск FastAPI сервера с Swagger"""
     print("🚀 Запуск FastAPI сервера (порт 8000)...")
@@ -89,8 +96,36 @@ def is_port_in_use(port: int) -> bool:
         return s.connect_ex(('localhost', port)) == 0
 
 
-def kill_process_on_port(port: int) -> bool:
-    """Попытка освободить порт"""
+def listening_pids_by_port() -> dict[int, set[int]] | None:
+    """
+    Один снимок psutil.net_connections: порт -> PID процессов, слушающих его.
+    None — если psutil не установлен или снимок недоступен (нет прав).
+    """
+    if psutil is None:
+        return None
+    try:
+        conns = psutil.net_connections(kind="inet")
+    except (psutil.AccessDenied, OSError):
+        return None
+    listeners: dict[int, set[int]] = {}
+    for c in conns:
+        if c.status == psutil.CONN_LISTEN and c.laddr:
+            pids = listeners.setdefault(c.laddr.port, set())
+            if c.pid is not None:
+                pids.add(c.pid)
+    return listeners
+
+
+def kill_process_on_port(port: int, pids: set[int] | None = None) -> bool:
+    """Попытка освободить порт (pids — из снимка psutil, иначе ищем через lsof)"""
+    if pids:
+        for pid in pids:
+            try:
+                psutil.Process(pid).kill()
+                print(f"   ⚠️  Освобожден порт {port} (процесс {pid})")
+            except psutil.Error:
+                pass
+        return True
     try:
         result = subprocess.run(
             ['lsof', '-ti', f':{port}'],
@@ -111,6 +146,24 @@ def kill_process_on_port(port: int) -> bool:
     return False
 
 
+def iter_exited(processes: list[subprocess.Popen]):
+    """
+    Отдаёт индексы процессов по мере их завершения.
+    На каждый процесс — поток, заблокированный в proc.wait(), так что
+    до выхода процесса нет ни одного пробуждения (в отличие от опроса poll()).
+    """
+    exited: queue.Queue[int] = queue.Queue()
+
+    def _wait(i: int, proc: subprocess.Popen) -> None:
+        proc.wait()
+        exited.put(i)
+
+    for i, proc in enumerate(processes):
+        threading.Thread(target=_wait, args=(i, proc), daemon=True).start()
+    for _ in processes:
+        yield exited.get()
+
+
 def main():
     """Запуск всех сервисов"""
     print("=" * 60)
@@ -120,10 +173,12 @@ def main():
     
     # Проверка и освобождение портов
     ports_to_check = [8000, 8502, 8503]
+    listeners = listening_pids_by_port()
     for port in ports_to_check:
-        if is_port_in_use(port):
+        busy = port in listeners if listeners is not None else is_port_in_use(port)
+        if busy:
             print(f"⚠️  Порт {port} занят, пытаюсь освободить...")
-            kill_process_on_port(port)
+            kill_process_on_port(port, listeners.get(port) if listeners is not None else None)
             time.sleep(1)
     
     processes = []
@@ -171,18 +226,14 @@ def main():
         print("Нажмите Ctrl+C для остановки всех сервисов")
         print("=" * 60)
         
-        # Ожидание завершения с периодической проверкой
+        # Ожидание завершения: блокируемся до выхода любого из процессов
         try:
-            while True:
-                time.sleep(1)
-                # Проверяем, что процессы еще работают
-                for i, proc in enumerate(processes):
-                    if proc.poll() is not None:
-                        print(f"\n⚠️  Процесс {i} завершился неожиданно")
-                        try:
-                            proc.communicate(timeout=1)
-                        except:
-                            pass
+            for i in iter_exited(processes):
+                print(f"\n⚠️  Процесс {i} завершился неожиданно")
+                try:
+                    processes[i].communicate(timeout=1)
+                except:
+                    pass
         except KeyboardInterrupt:
             pass
             
@@ -27,6 +27,9 @@ from src.config import DATA_DIR
 PROJECTS_DIR = DATA_DIR / "api_projects"
 PROJECTS_DIR.mkdir(parents=True, exist_ok=True)
 
+_RE_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"|?*\x00-\x1f]')
+_RE_UNSAFE_ID_CHARS = re.compile(r'[^a-zA-Z0-9_-]')
+
 
 @dataclass
 class Project:
@@ -83,7 +86,7 @@ class ProjectStorage:
         # Remove path components
         filename = Path(filename).name
         # Remove dangerous characters
-        filename = re.sub(r'[<>:"|?*\x00-\x1f]', '', filename)
+        filename = _RE_UNSAFE_FILENAME_CHARS.sub('', filename)
         # Limit length
         if len(filename) > 255:
             filename = filename[:255]
@@ -196,7 +199,7 @@ class ProjectStorage:
         project_dir.mkdir(exist_ok=True)
         
         # Use UUID for statement_id to prevent collisions and path issues
-        safe_statement_id = re.sub(r'[^a-zA-Z0-9_-]', '', statement_id)
+        safe_statement_id = _RE_UNSAFE_ID_CHARS.sub('', statement_id)
         file_path = project_dir / f"{safe_statement_id}_{filename}"
         
         # Final check: ensure path is within project_dir
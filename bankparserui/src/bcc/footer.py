@@ -191,6 +191,10 @@ def parse_bcc_footer(jsonl_path: str) -> Dict[str, Optional[float]]:
             line = line.strip()
             if line:
                 pages.append(json.loads(line))
+    return parse_bcc_footer_from_pages(pages)
+
+def parse_bcc_footer_from_pages(pages: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """Same as parse_bcc_footer, for pages the caller has already loaded."""
     words = flatten_and_sort(pages)
     lines = cluster_lines(words)
     return parse_footer_from_lines(lines)
@@ -8,7 +8,7 @@
 from __future__ import annotations
 import re
 import pandas as pd
-from typing import Optional
+from typing import Dict, Optional
 
 # ---------- Common helpers/regex ----------
 WS = r" \t\r\n\u00A0\u202F"
@@ -18,23 +18,63 @@ S1 = rf"[{WS}]+"
 # number like: 403480.88  |  403 480,88  |  403 480.88  |  +1,00 / -1.00
 NUM_RE = r"[+-]?\d[\d \u00A0\u202F]*[.,]\d{2}"
 
-def _last(text: str, pat: str, flags: int = 0) -> Optional[str]:
-    """Return last captured group(1) match trimmed, else None."""
-    m = None
-    for m in re.finditer(pat, text, flags):
-        pass
-    return m.group(1).strip() if m else None
+_DATE = r"[0-9]{2}\.[0-9]{2}\.[0-9]{4}"
+
+# ---------- Field patterns ----------
+# Каждое поле – lookahead с именованной группой: совпадение нулевой длины, поэтому
+# поля, лежащие на одной строке (например, «Клиент: ... ИИН: ...»), не съедают друг друга,
+# а весь текст страницы сканируется одним проходом finditer.
+_FIELD_PATTERNS = (
+    rf'(?i:(?P<bank>АО{S1}«?Банк{S1}ЦентрКредит»?))',
+    rf'Регистрационный{S1}номер{S1}Исх\.?{S0}№{S0}(?P<reg_no>[0-9A-Za-z\-\/]+)',
+    rf'(?i:(?:Құрылған{S1}күні|Дата{S1}формирования):{S0}(?P<formed>{_DATE}(?:{S1}[0-9]{{2}}:[0-9]{{2}}:[0-9]{{2}})?))',
+    rf'(?:Тегін{S1}қолдау{S1}телефондары|Бесплатные{S1}телефоны{S1}поддержки):{S0}(?P<phones>[^\n]+)',
+    rf'Клиент(?:{S1}/{S1}(?:Клиент|Client))?{S0}:{S0}(?P<client>.+?)(?:\r?\n|$)',
+    rf'(?i:(?:ЖСН{S0}/{S0}ИИН|ЖСН|ИИН|БИН){S0}:{S0}(?P<iin_bin>[0-9]{{9,12}}))',
+    rf'(?:ЖСК|ИИК|IBAN){S0}:{S0}(?P<iban>[Kk][Zz][0-9A-Za-z]{{16,30}})',
+    rf'(?:БСК|БИК|BIC){S0}:{S0}(?P<bic>[A-Z0-9]{{8,11}})',
+    rf'(?:Валютасы|Валюта){S0}:{S0}(?P<ccy>[A-Z]{{3}})',
+    # "Движения по счету c 01.06.2023 по 31.05.2024"
+    rf'Движения{S1}по{S1}счету{S1}c{S1}(?P<period_start_ru>{_DATE})(?:{S1}по{S1}(?P<period_end_ru>{_DATE}))?',
+    # "Есепшот бойынша 01.06.2023 бастап 31.05.2024 дейінгі қозғалыс"
+    rf'Есепшот{S1}бойынша{S1}(?P<period_start_kz>{_DATE}){S1}бастап'
+    rf'(?:{S1}(?P<period_end_kz>{_DATE}){S1}дейінгі{S1}қозғалыс)?',
+    rf'(?i:(?:Несие{S1}лимиті|Кредитный{S1}лимит):{S0}(?P<credit_limit>{NUM_RE}|0(?:[.,]00)?))',
+    rf'(?i:(?:Кіріс{S1}қалдық|Входящий{S1}остаток):{S0}(?P<opening>{NUM_RE}|[+-]?\d+))',
+    rf'(?i:(?:Кіріс{S1}сальдо|Входящее{S1}сальдо):{S0}(?P<incoming_saldo>{NUM_RE}|[+-]?\d+))',
+    rf'(?i:(?:Нақты{S1}қалдық|Реальный{S1}баланс):{S0}(?P<real_balance>{NUM_RE}))',
+    rf'(?i:(?:Қаражатқа{S1}тосқауыл{S1}қою|Блокированные{S1}средства):{S0}(?P<blocked>{NUM_RE}|0(?:[.,]00)?))',
+)
+_FUSED_RE = re.compile("|".join(f"(?={p})" for p in _FIELD_PATTERNS))
+_CLIENT_FALLBACK_RE = re.compile(r'Клиент[^\n\r:]*:(.+)')
+_SPACES_RE = re.compile(r"\s+")
+
+def _scan_fields(text: str) -> Dict[str, str]:
+    """Single pass over text: last trimmed match for every named field."""
+    last: Dict[str, str] = {}
+    for m in _FUSED_RE.finditer(text):
+        for k, v in m.groupdict().items():
+            if v is not None:
+                last[k] = v.strip()
+    return last
 
 def _norm_spaces(s: Optional[str]) -> Optional[str]:
     if s is None:
         return None
-    return re.sub(r"\s+", " ", s.replace("\u00A0", " ").replace("\u202F", " ")).strip()
+    return _SPACES_RE.sub(" ", s.replace("\u00A0", " ").replace("\u202F", " ")).strip()
+
+# пробелы-разделители тысяч (обычный, NBSP, узкий NBSP) – удаляем одним translate
+_NUM_SPACE_DROP = str.maketrans("", "", " \u00A0\u202F")
 
 def _to_float(num: Optional[str]) -> Optional[float]:
     if num is None:
         return None
-    t = num.replace("\u00A0", " ").replace("\u202F", " ")
-    t = t.replace(" ", "")
+    t = num.translate(_NUM_SPACE_DROP)
+    try:
+        # быстрый путь: "403480.88", "-1.00", "0"
+        return float(t)
+    except ValueError:
+        pass
     # prefer comma as decimal if present; else dot
     if "," in t and "." in t:
         # If both exist, assume thousand-sep is the one appearing first
@@ -55,39 +95,30 @@ def _to_float(num: Optional[str]) -> Optional[float]:
 def parse_bcc_header(page_text: str) -> pd.DataFrame:
     t = page_text or ""
 
+    f = _scan_fields(t)
+
     # Bank name (accept lines like: АО «Банк ЦентрКредит»)
-    bank_name = _last(t, rf'(АО{S1}«?Банк{S1}ЦентрКредит»?)', re.IGNORECASE)
+    bank_name = f.get("bank")
 
     # Registration / outgoing number (may appear as "Регистрационный номер Исх. № 15201")
-    reg_no = _last(t, rf'Регистрационный{S1}номер{S1}Исх\.?{S0}№{S0}([0-9A-Za-z\-\/]+)')
+    reg_no = f.get("reg_no")
 
     # Formed at (date & optional time)
-    formed_dt = _last(
-        t,
-        rf'(?:Құрылған{S1}күні|Дата{S1}формирования):{S0}([0-9]{{2}}\.[0-9]{{2}}\.[0-9]{{4}}(?:{S1}[0-9]{{2}}:[0-9]{{2}}:[0-9]{{2}})?)',
-        re.IGNORECASE,
-    )
+    formed_dt = f.get("formed")
 
     # Support phones (optional; grab the right side after colon)
-    support_phones = _last(
-        t,
-        rf'(?:Тегін{S1}қолдау{S1}телефондары|Бесплатные{S1}телефоны{S1}поддержки):{S0}([^\n]+)'
-    )
+    support_phones = f.get("phones")
 
-    # Client
     # Client
     # Пытаемся поймать:
     #   "Клиент: ТОО Ромашка"
     #   "Клиент / Клиент: ИП ..."
     #   "Клиент / Client: ТОО ..."
-    client = _last(
-        t,
-        rf'Клиент(?:{S1}/{S1}(?:Клиент|Client))?{S0}:{S0}(.+?)(?:\r?\n|$)'
-    )
+    client = f.get("client")
 
     # Если не нашли – очень широкий фоллбэк:
     if not client:
-        m = re.search(r'Клиент[^\n\r:]*:(.+)', t)
+        m = _CLIENT_FALLBACK_RE.search(t)
         if m:
             client = m.group(1)
 
@@ -102,93 +133,48 @@ def parse_bcc_header(page_text: str) -> pd.DataFrame:
 
     # IIN/BIN (ИИН/БИН)
 
-    iin_bin = _last(
-        t,
-        rf'(?:ЖСН{S0}/{S0}ИИН|ЖСН|ИИН|БИН){S0}:{S0}([0-9]{{9,12}})',
-        re.IGNORECASE,
-    )
+    iin_bin = f.get("iin_bin")
 
     # IIK/IBAN (ЖСК/ИИК)
-    iban = _last(
-        t,
-        rf'(?:ЖСК|ИИК|IBAN){S0}:{S0}([Kk][Zz][0-9A-Za-z]{{16,30}})',
-    )
+    iban = f.get("iban")
     if iban:
         iban = iban.upper()
 
     # BIC (БСК/БИК)
-    bic = _last(
-        t,
-        rf'(?:БСК|БИК|BIC){S0}:{S0}([A-Z0-9]{{8,11}})'
-    )
+    bic = f.get("bic")
 
     # Currency
-    ccy = _last(
-        t,
-        rf'(?:Валютасы|Валюта){S0}:{S0}([A-Z]{{3}})'
-    )
+    ccy = f.get("ccy")
 
     # Period: try Russian first: "Движения по счету c 01.06.2023 по 31.05.2024"
-    period_start = _last(
-        t,
-        rf'Движения{S1}по{S1}счету{S1}c{S1}([0-9]{{2}}\.[0-9]{{2}}\.[0-9]{{4}})'
-    )
-    period_end = _last(
-        t,
-        rf'Движения{S1}по{S1}счету{S1}c{S1}[0-9]{{2}}\.[0-9]{{2}}\.[0-9]{{4}}{S1}по{S1}([0-9]{{2}}\.[0-9]{{2}}\.[0-9]{{4}})'
-    )
+    period_start = f.get("period_start_ru")
+    period_end = f.get("period_end_ru")
     # Kazakh variant (if Russian didn’t hit): "Есепшот бойынша ... бастап ... дейінгі қозғалыс"
     if not period_start:
-        period_start = _last(
-            t,
-            rf'Есепшот{S1}бойынша{S1}([0-9]{{2}}\.[0-9]{{2}}\.[0-9]{{4}}){S1}бастап',
-        )
+        period_start = f.get("period_start_kz")
     if not period_end:
-        period_end = _last(
-            t,
-            rf'Есепшот{S1}бойынша{S1}[0-9]{{2}}\.[0-9]{{2}}\.[0-9]{{4}}{S1}бастап{S1}([0-9]{{2}}\.[0-9]{{2}}\.[0-9]{{4}}){S1}дейінгі{S1}қозғалыс',
-        )
+        period_end = f.get("period_end_kz")
 
     # Credit limit
-    credit_limit_raw = _last(
-        t,
-        rf'(?:Несие{S1}лимиті|Кредитный{S1}лимит):{S0}({NUM_RE}|0(?:[.,]00)?)',
-        re.IGNORECASE,
-    )
+    credit_limit_raw = f.get("credit_limit")
     credit_limit = _to_float(credit_limit_raw)
 
     # Opening balance (Входящий остаток)
     # Opening balance (Входящий остаток)
-    opening_raw = _last(
-        t,
-        rf'(?:Кіріс{S1}қалдық|Входящий{S1}остаток):{S0}({NUM_RE}|[+-]?\d+)',
-        re.IGNORECASE,
-    )
+    opening_raw = f.get("opening")
     opening_balance = _to_float(opening_raw)
 
 
     # Incoming saldo (Входящее сальдо) — sometimes duplicated: keep as separate, but we’ll backfill if needed
-    incoming_saldo_raw = _last(
-        t,
-        rf'(?:Кіріс{S1}сальдо|Входящее{S1}сальдо):{S0}({NUM_RE}|[+-]?\d+)',
-        re.IGNORECASE,
-    )
+    incoming_saldo_raw = f.get("incoming_saldo")
     incoming_saldo = _to_float(incoming_saldo_raw)
 
     # Real balance
-    real_balance_raw = _last(
-        t,
-        rf'(?:Нақты{S1}қалдық|Реальный{S1}баланс):{S0}({NUM_RE})',
-        re.IGNORECASE,
-    )
+    real_balance_raw = f.get("real_balance")
     real_balance = _to_float(real_balance_raw)
 
     # Blocked funds
-    blocked_raw = _last(
-        t,
-        rf'(?:Қаражатқа{S1}тосқауыл{S1}қою|Блокированные{S1}средства):{S0}({NUM_RE}|0(?:[.,]00)?)',
-        re.IGNORECASE,
-    )
+    blocked_raw = f.get("blocked")
     blocked_funds = _to_float(blocked_raw)
 
     # Backfill: if opening missing but incoming saldo present, use it
@@ -53,6 +53,10 @@ from src.ui.ui_analysis_report_generator import get_ui_analysis_tables
 # Helpers
 # ---------------------------------------------------------------------------
 
+# thousands separators / (narrow) no-break spaces dropped from amounts in one pass
+_AMT_STRIP = str.maketrans("", "", ", \u00A0\u202F")
+
+
 def _json_default(obj: Any) -> Any:
     if isinstance(obj, Decimal):
         return float(obj)
@@ -168,7 +172,7 @@ def process_one_halyk_a(
     def clean_val(v):
         if pd.isna(v) or v == '': return 0.0
         if isinstance(v, (int, float)): return float(v)
-        return float(str(v).replace(',', '').replace(' ', '').replace('\xa0', '').strip())
+        return float(str(v).translate(_AMT_STRIP).strip())
 
     # Генерируем 'amount' (Кредит - Дебет)
     ui_input_df['amount'] = ui_input_df['Кредит'].apply(clean_val) - ui_input_df['Дебет'].apply(clean_val)
@@ -41,24 +41,11 @@ def find_cardlast4(text: str) -> str:
     return m.group(1) if m else ""
 
 
-def extract_summary_reported_from_page(page: fitz.Page) -> Dict[str, float]:
+def page_spans_df(page: fitz.Page) -> pd.DataFrame:
     """
-    Parse the short summary box (Покупки / Переводы / ... ) on page 1.
-
-    We scan spans in y0,x0 order. For each label we know
-    ("Покупки", "Переводы", etc.) we look ahead a few spans to find
-    the first thing that looks like a currency amount and parse it.
-
-    Returns:
-        {
-            "Покупки": -1023995.00,
-            "Переводы": -1199436.00,
-            ...
-        }
+    Non-empty text spans of a page as a DataFrame with columns
+    ['text','x0','y0','x1','y1'], sorted in reading order (y0, x0).
     """
-    wanted_labels = ["Покупки", "Переводы", "Пополнения", "Разное", "Снятия"]
-    reported: Dict[str, float] = {}
-
     spans_list: List[Dict[str, float]] = []
     d = page.get_text("dict")
     for b in d.get("blocks", []):
@@ -79,9 +66,39 @@ def extract_summary_reported_from_page(page: fitz.Page) -> Dict[str, float]:
                 })
 
     if not spans_list:
-        return reported
+        return pd.DataFrame(columns=["text", "x0", "y0", "x1", "y1"])
 
-    spans_df = pd.DataFrame(spans_list).sort_values(["y0", "x0"]).reset_index(drop=True)
+    return pd.DataFrame(spans_list).sort_values(["y0", "x0"]).reset_index(drop=True)
+
+
+def extract_summary_reported_from_page(
+    page: fitz.Page,
+    spans_df: Optional[pd.DataFrame] = None,
+) -> Dict[str, float]:
+    """
+    Parse the short summary box (Покупки / Переводы / ... ) on page 1.
+
+    We scan spans in y0,x0 order. For each label we know
+    ("Покупки", "Переводы", etc.) we look ahead a few spans to find
+    the first thing that looks like a currency amount and parse it.
+
+    Returns:
+        {
+            "Покупки": -1023995.00,
+            "Переводы": -1199436.00,
+                  ...
+        }
+
+    spans_df: page spans as returned by page_spans_df(); pass it when the
+    caller already has them to avoid decoding the page again.
+    """
+    wanted_labels = ["Покупки", "Переводы", "Пополнения", "Разное", "Снятия"]
+    reported: Dict[str, float] = {}
+
+    if spans_df is None:
+        spans_df = page_spans_df(page)
+    if spans_df.empty:
+        return reported
 
     for i, row in spans_df.iterrows():
         label = row["text"]
@@ -97,7 +114,10 @@ def extract_summary_reported_from_page(page: fitz.Page) -> Dict[str, float]:
     return reported
 
 
-def extract_balances_from_page(page: fitz.Page) -> Dict[str, Optional[float]]:
+def extract_balances_from_page(
+    page: fitz.Page,
+    spans_df: Optional[pd.DataFrame] = None,
+) -> Dict[str, Optional[float]]:
     """
     Kaspi summary layout example:
 
@@ -116,33 +136,16 @@ def extract_balances_from_page(page: fitz.Page) -> Dict[str, Optional[float]]:
             "opening_balance": <float or None>,
             "closing_balance": <float or None>
         }
+
+    spans_df: optional pre-collected page spans (see page_spans_df()).
     """
     balances_by_date: List[Tuple[str, float]] = []
 
-    spans_list: List[Dict[str, float]] = []
-    d = page.get_text("dict")
-    for b in d.get("blocks", []):
-        if b.get("type") != 0:
-            continue
-        for ln in b.get("lines", []):
-            for sp in ln.get("spans", []):
-                txt = (sp.get("text") or "").strip()
-                if not txt:
-                    continue
-                x0, y0, x1, y1 = sp["bbox"]
-                spans_list.append({
-                    "text": txt,
-                    "x0": x0,
-                    "y0": y0,
-                    "x1": x1,
-                    "y1": y1,
-                })
-
-    if not spans_list:
+    if spans_df is None:
+        spans_df = page_spans_df(page)
+    if spans_df.empty:
         return {"opening_balance": None, "closing_balance": None}
 
-    spans_df = pd.DataFrame(spans_list).sort_values(["y0", "x0"]).reset_index(drop=True)
-
     # e.g. "Доступно на 01.09.24"
     avail_re = re.compile(
         r"доступно\s+на\s+(\d{2}\.\d{2}\.\d{2,4})",
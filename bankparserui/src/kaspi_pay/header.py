@@ -1,23 +1,88 @@
-# We'll load the JSONL, pick page 1, and parse header fields into a tidy DataFrame.
+# We'll load the JSONL, pick page 1, and parse header fields into a dict (one header row).
 import json
 import re
+from functools import lru_cache
 from typing import Optional, Tuple, Dict, Any, List
-import pandas as pd
 
 
 SPACE_CHARS = r"\u00A0\u202F"  # NBSP + narrow NBSP
 S = SPACE_CHARS  # alias for compact f-strings
 
-def _re_get(pattern: str, text: str, flags=0) -> Optional[str]:
-    m = re.search(pattern, text, flags)
-    return m.group(1).strip() if m else None
+# Whitespace the header text can still contain after _RE_TABS has collapsed
+# tabs/space runs: spaces, line breaks and no-break spaces. An explicit class
+# is cheaper for _sre than the Unicode-aware \s.
+_WS = rf"[ \r\n{SPACE_CHARS}]"
 
-def _extract_period(text: str) -> Tuple[Optional[str], Optional[str]]:
-    # e.g., "Период: 29.09.2024 - 29.09.2025"
-    m = re.search(r"Период:\s*(\d{2}\.\d{2}\.\d{4})\s*[-–]\s*(\d{2}\.\d{2}\.\d{4})", text)
-    if m:
-        return m.group(1), m.group(2)
-    return None, None
+_RE_ACCOUNT = re.compile(rf"Лицевой{_WS}+счет:{_WS}*([A-Z0-9]+)")
+_RE_CURRENCY = re.compile(rf"Валюта{_WS}+счета:{_WS}*([A-Z]{{3}})")
+_RE_PERIOD = re.compile(rf"Период:{_WS}*(\d{{2}}\.\d{{2}}\.\d{{4}}){_WS}*[-–]{_WS}*(\d{{2}}\.\d{{2}}\.\d{{4}})")
+_RE_LAST_MOVE = re.compile(rf"Дата{_WS}+последнего{_WS}+движения:{_WS}*([0-9.: \-]+)")
+_RE_IIN = re.compile(rf"ИИН/БИН:{_WS}*([0-9]+)")
+_RE_CLIENT = re.compile(rf"Наименование{_WS}+клиента:{_WS}*(.+)")
+_RE_TABS = re.compile(r"[ \t]+")
+_RE_AMT_CCY = re.compile(rf"([\d {SPACE_CHARS}.,]+)\s*([A-Z]{{3}})")
+_RE_SPACES_NUM = re.compile(rf"[ {SPACE_CHARS}]")
+
+# all single-value header fields in one alternation, so the page text is scanned once
+_RE_HEADER = re.compile(
+    rf"""
+      Лицевой{_WS}+счет:{_WS}*                  (?P<account>[A-Z0-9]+)
+    | Валюта{_WS}+счета:{_WS}*                  (?P<currency>[A-Z]{{3}})
+    | Период:{_WS}*                             (?P<period_start>\d{{2}}\.\d{{2}}\.\d{{4}})
+                   {_WS}*[-–]{_WS}*             (?P<period_end>\d{{2}}\.\d{{2}}\.\d{{4}})
+    | Дата{_WS}+последнего{_WS}+движения:{_WS}* (?P<last_move>[0-9.: \-]+)
+    | ИИН/БИН:{_WS}*                            (?P<iin_bin>[0-9]+)
+    | Наименование{_WS}+клиента:{_WS}*          (?P<client>.+)
+    """,
+    re.VERBOSE,
+)
+# field -> (dedicated pattern, group) used when the single pass may have missed it
+_HEADER_FIELD_PATTERNS: Dict[str, Tuple[re.Pattern, int]] = {
+    "account": (_RE_ACCOUNT, 1),
+    "currency": (_RE_CURRENCY, 1),
+    "period_start": (_RE_PERIOD, 1),
+    "period_end": (_RE_PERIOD, 2),
+    "last_move": (_RE_LAST_MOVE, 1),
+    "iin_bin": (_RE_IIN, 1),
+    "client": (_RE_CLIENT, 1),
+}
+
+
+def _extract_header_fields(text: str) -> Dict[str, Optional[str]]:
+    """
+    First occurrence of every header field, found in a single finditer pass.
+
+    The client pattern takes the rest of its line, so it can swallow a label
+    that follows it on the same line; any field not seen before the first
+    client match is re-checked with its own pattern.
+    """
+    found: Dict[str, Tuple[int, str]] = {}
+    for m in _RE_HEADER.finditer(text):
+        for name, val in m.groupdict().items():
+            if val is not None and name not in found:
+                found[name] = (m.start(), val)
+
+    client_pos = found["client"][0] if "client" in found else None
+
+    fields: Dict[str, Optional[str]] = {}
+    for name, (pattern, group) in _HEADER_FIELD_PATTERNS.items():
+        if name in found and (client_pos is None or found[name][0] <= client_pos):
+            val: Optional[str] = found[name][1]
+        elif client_pos is None:
+            val = None
+        else:
+            m = pattern.search(text)
+            val = m.group(group) if m else None
+        fields[name] = val.strip() if val is not None else None
+    return fields
+
+@lru_cache(maxsize=16)
+def _compile_balance(label: str) -> re.Pattern:
+    # compiled once per label ("Входящий остаток", "Исходящий остаток", ...)
+    return re.compile(
+        rf"{re.escape(label)}:?[\s\S]{{0,120}}?"         # up to 120 chars after label, including newlines
+        rf"([\d {SPACE_CHARS}.,]+)\s*([A-Z]{{3}})"       # number with spaces/commas + 3-letter ccy
+    )
 
 def _extract_balance(label: str, text: str):
     """
@@ -25,13 +90,9 @@ def _extract_balance(label: str, text: str):
     Returns a string "2 201 173,4 KZT" or None.
     """
     # Collapse tabs/multiple spaces but keep newlines so we can search across them
-    t = re.sub(r"[ \t]+", " ", text)
+    t = _RE_TABS.sub(" ", text)
 
-    pat = (
-        rf"{re.escape(label)}:?[\s\S]{{0,120}}?"         # up to 120 chars after label, including newlines
-        rf"([\d {SPACE_CHARS}.,]+)\s*([A-Z]{{3}})"       # number with spaces/commas + 3-letter ccy
-    )
-    m = re.search(pat, t)
+    m = _compile_balance(label).search(t)
     if m:
         amount_raw = m.group(1).strip()
         ccy = m.group(2).strip()
@@ -44,41 +105,40 @@ def _normalize_amount_to_float(amount_str: str):
     """
     if not amount_str:
         return None, None
-    m = re.search(r"([\d \u00A0\u202F.,]+)\s*([A-Z]{3})", amount_str)
+    m = _RE_AMT_CCY.search(amount_str)
     if not m:
         return None, None
     num = m.group(1)
     ccy = m.group(2)
-    num = re.sub(r"[ \u00A0\u202F]", "", num).replace(",", ".")
+    num = _RE_SPACES_NUM.sub("", num).replace(",", ".")
     try:
         return float(num), ccy
     except ValueError:
         return None, ccy
 
-def parse_header_page(page):
+def parse_header_page(page: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Parse header fields of one JSONL page into a plain dict
+    (column name -> value); callers build the DataFrame.
+    """
     text: str = page.get("text") or ""
-    text_norm = re.sub(r"[ \t]+", " ", text)
+    text_norm = _RE_TABS.sub(" ", text)
 
-    account = _re_get(r"Лицевой\s+счет:\s*([A-Z0-9]+)", text_norm)
-    currency = _re_get(r"Валюта\s+счета:\s*([A-Z]{3})", text_norm)
-    period_start, period_end = _extract_period(text_norm)
-    last_move = _re_get(r"Дата\s+последнего\s+движения:\s*([0-9.: \-]+)", text_norm)
-    iin_bin = _re_get(r"ИИН/БИН:\s*([0-9]+)", text_norm)
-    client = _re_get(r"Наименование\s+клиента:\s*(.+)", text_norm)
+    fields = _extract_header_fields(text_norm)
 
     # ← use the relaxed extractor on the RAW text
     opening_balance = _extract_balance("Входящий остаток", text)
     closing_balance = _extract_balance("Исходящий остаток", text)
 
-    return pd.DataFrame([{
-        "Лицевой счет": account,
-        "Валюта счета": currency,
-        "Период (начало)": period_start,
-        "Период (конец)": period_end,
-        "Дата последнего движения": last_move,
-        "ИИН/БИН": iin_bin,
-        "Наименование клиента": client,
+    return {
+        "Лицевой счет": fields["account"],
+        "Валюта счета": fields["currency"],
+        "Период (начало)": fields["period_start"],
+        "Период (конец)": fields["period_end"],
+        "Дата последнего движения": fields["last_move"],
+        "ИИН/БИН": fields["iin_bin"],
+        "Наименование клиента": fields["client"],
         "Входящий остаток": opening_balance,
         "Исходящий остаток": closing_balance,
-    }])
+    }
 
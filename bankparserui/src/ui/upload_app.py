@@ -43,6 +43,9 @@ TAXPAYER_API_PORTAL_HOST = os.environ.get(
 )
 API_BASE_URL = os.environ.get("API_BASE_URL", "http://127.0.0.1:8000")
 
+# thousands separators / (narrow) no-break spaces dropped from amounts in one pass
+_AMT_STRIP = str.maketrans("", "", ", \u00A0\u202F")
+
 
 def check_api_health() -> tuple[bool, str]:
     """Check API availability for inter-service connectivity diagnostics."""
@@ -1070,7 +1073,7 @@ def display_admin_tables(processed_statements: List[Any]):
             return 0.0
         if isinstance(v, (int, float)):
             return float(v)
-        s = str(v).replace(',', '').replace(' ', '').replace('\xa0', '').replace('\u00A0', '').strip()
+        s = str(v).translate(_AMT_STRIP).strip()
         try:
             return float(s)
         except:
@@ -1092,7 +1095,10 @@ def display_admin_tables(processed_statements: List[Any]):
     # Determine description
     desc_col = next((c for c in ['Детали платежа', 'Описание операции', 'details', 
                                 'Назначение платежа', 'operation'] if c in df_analysis.columns), None)
-    df_analysis['details'] = df_analysis[desc_col].fillna('') if desc_col else ''
+    # string dtype: compact and fast for the .str lookups downstream; with no
+    # description column 'details' is simply absent (treated as '' downstream)
+    if desc_col:
+        df_analysis['details'] = df_analysis[desc_col].fillna('').astype('string')
     
     # Determine counterparty
     import re
@@ -1113,9 +1119,10 @@ def display_admin_tables(processed_statements: List[Any]):
         name_fallback = cp_text.split('\n')[0].strip() if cp_text else (row.get('details') or 'N/A')
         return str(name_fallback), str(name_fallback)
     
-    cp_results = df_analysis.apply(get_cp_data, axis=1)
-    df_analysis['counterparty_id'] = [x[0] for x in cp_results]
-    df_analysis['counterparty_name'] = [x[1] for x in cp_results]
+    # expand the (id, name) tuples straight into two columns in one pass
+    df_analysis[['counterparty_id', 'counterparty_name']] = df_analysis.apply(
+        get_cp_data, axis=1, result_type='expand'
+    )
     
     # Generate analysis tables
     analysis = get_ui_analysis_tables(df_analysis)
@@ -0,0 +1,31 @@
+"""
+Bounded process-pool runner shared by the batch conversion scripts.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TypeVar
+
+J = TypeVar("J")
+R = TypeVar("R")
+
+
+def run_jobs(jobs: Iterable[J], fn: Callable[[J], R], workers: int) -> Iterator[R]:
+    """
+    Yield fn(job) for every job in completion order, using up to `workers` processes.
+
+    At most 2 * workers jobs are in flight, so memory stays bounded on large corpora.
+    `fn` must be a top-level function so it can be pickled for the pool;
+    workers <= 1 runs the jobs sequentially in this process.
+    """
+    if workers <= 1:
+        for job in jobs:
+            yield fn(job)
+        return
+    pending = iter(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        in_flight = {ex.submit(fn, job) for job in islice(pending, 2 * workers)}
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+            in_flight |= {ex.submit(fn, job) for job in islice(pending, len(done))}
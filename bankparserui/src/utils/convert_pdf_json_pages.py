@@ -5,13 +5,15 @@ import os
 import json
 import base64
 import argparse
+import warnings
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
 
-import pdfplumber
 try:
-    import pikepdf  # type: ignore
+    import orjson  # type: ignore
 except Exception:
-    pikepdf = None
+    orjson = None
 
 # --- Resolve project root & import DATA_DIR safely --------------------------
 PROJECT_ROOT = Path(__file__).resolve().parents[2]  # repo root (…/bank_statements_otbasy)
@@ -25,16 +27,195 @@ except Exception:
     DATA_DIR = PROJECT_ROOT / "data"
 
 # --- Core -------------------------------------------------------------------
+def _dumps_line(record: dict) -> bytes:
+    """One JSONL line as UTF-8 bytes; orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        try:
+            # numpy scalars/arrays (if a pdfplumber backend yields them) are encoded natively
+            return orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+def _preview_b64(preview: memoryview, full_b64: Optional[bytes]) -> str:
+    """
+    base64 of the stream preview. When the whole stream is already encoded, its
+    prefix is reused: every complete 3-byte group of the preview maps to the same
+    4 chars, so only the trailing partial group is encoded again.
+    """
+    if full_b64 is None:
+        return base64.b64encode(preview).decode("ascii")
+    whole = len(preview) // 3
+    return (full_b64[:whole * 4] + base64.b64encode(preview[whole * 3:])).decode("ascii")
+
+
+# include_full_stream: larger content streams are truncated to this many bytes.
+DEFAULT_MAX_FULL_STREAM_BYTES = 1_000_000
+
+# JSONL output: pages per writelines() batch and the file buffer size.
+_JSONL_BATCH_PAGES = 32
+_JSONL_WRITE_BUFFER = 1024 * 1024
+
+# Below this many pages the process start-up costs more than it saves.
+_PARALLEL_MIN_PAGES = 8
+
+PageTextWords = Tuple[str, List[Dict[str, Any]]]
+
+
+def _page_text_words(p, normalize_floats: bool = False) -> PageTextWords:
+    text = p.extract_text() or ""
+    # geometry is critical for your downstream column banding
+    words = p.extract_words(
+        x_tolerance=2,
+        y_tolerance=2,
+        keep_blank_chars=False
+    )
+    # pdfplumber already yields floats; the coercion pass is opt-in
+    if normalize_floats:
+        for w in words:
+            for k in ("x0", "x1", "top", "bottom"):
+                if k in w and isinstance(w[k], (int, float)):
+                    w[k] = float(w[k])
+    return text, words
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int, normalize_floats: bool = False) -> List[PageTextWords]:
+    # process-pool worker: each worker opens the PDF itself and handles one page range
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pl:
+        return [_page_text_words(p, normalize_floats) for p in pl.pages[start:stop]]
+
+
+def _iter_text_and_words(
+    pdf_path: Path,
+    page_workers: Optional[int],
+    normalize_floats: bool = False,
+) -> Iterator[PageTextWords]:
+    """
+    pdfplumber text + words for every page, in page order. Short PDFs (or
+    page_workers=1) are extracted lazily page by page, so the caller can
+    interleave its own per-page work with the same pages. pdfminer is CPU-bound
+    and pages are independent, so long PDFs are split into contiguous page
+    ranges extracted in parallel processes.
+    """
+    import pdfplumber
+    with pdfplumber.open(str(pdf_path)) as pl:
+        n_pages = len(pl.pages)
+        workers = min(page_workers or os.cpu_count() or 1, n_pages)
+        if workers <= 1 or n_pages < _PARALLEL_MIN_PAGES:
+            for p in pl.pages:
+                yield _page_text_words(p, normalize_floats)
+            return
+
+    bounds = [(i * n_pages // workers, (i + 1) * n_pages // workers) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        chunks = ex.map(_extract_page_range, [str(pdf_path)] * workers,
+                        [b[0] for b in bounds], [b[1] for b in bounds],
+                        [normalize_floats] * workers)
+        for chunk in chunks:
+            yield from chunk
+
+
+TextBackend = Literal["pdfplumber", "pymupdf"]
+WordsLayout = Literal["records", "columnar"]
+
+
+def words_to_columnar(words: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Word dicts (one dict per word) -> one list per key, e.g.
+    {"text": [...], "x0": [...], ...}. Keys missing on a word become None.
+    """
+    keys: Dict[str, None] = {}
+    for w in words:
+        keys.update(dict.fromkeys(w))
+    return {k: [w.get(k) for w in words] for k in keys}
+
+
+def words_to_records(words: Any) -> List[Dict[str, Any]]:
+    """Inverse of words_to_columnar; a list of word dicts is returned as-is."""
+    if not isinstance(words, dict):
+        return words
+    cols = list(words.items())
+    n = len(cols[0][1]) if cols else 0
+    return [{k: v[i] for k, v in cols} for i in range(n)]
+
+
+def _iter_text_and_words_pymupdf(pdf_path: Path) -> Iterator[PageTextWords]:
+    """
+    PyMuPDF (MuPDF) text + words, several times faster than pdfminer. Word
+    dicts carry the pdfplumber keys the parsers read (text, x0, x1, top,
+    doctop, bottom, ...); page.get_text("words") already yields floats.
+    Plain text follows MuPDF's reading order, which may differ from
+    pdfplumber's extract_text() layout.
+    """
+    try:
+        import pymupdf  # type: ignore
+    except ImportError:
+        import fitz as pymupdf  # type: ignore  # PyMuPDF < 1.24
+
+    with pymupdf.open(str(pdf_path)) as doc:
+        doctop = 0.0
+        for page in doc:
+            words = [
+                {
+                    "text": w[4],
+                    "x0": w[0],
+                    "x1": w[2],
+                    "top": w[1],
+                    "doctop": doctop + w[1],
+                    "bottom": w[3],
+                    "upright": True,
+                    "height": w[3] - w[1],
+                    "width": w[2] - w[0],
+                }
+                for w in page.get_text("words")
+            ]
+            yield page.get_text("text").rstrip("\n"), words
+            doctop += page.rect.height
+
+
 def dump_pdf_pages(
     pdf_path: Path,
     out_path: Path | None = None,
     stream_preview_len: int = 4000,
     include_full_stream: bool = False,
+    page_workers: Optional[int] = 1,
+    stream_text_preview: bool = True,
+    normalize_word_floats: bool = False,
+    backend: TextBackend = "pdfplumber",
+    words_layout: WordsLayout = "records",
+    max_full_stream_bytes: Optional[int] = DEFAULT_MAX_FULL_STREAM_BYTES,
 ) -> Path:
     """
     Extract per-page text, word geometry (via pdfplumber), and content-stream previews (via pikepdf).
     Writes a JSONL file, one page per line.
+
+    page_workers: processes for the pdfplumber pass (1 = sequential, the default;
+    None = CPU count). Only CLI/batch entry points opt in: library callers such
+    as the API/UI adapters run inside threaded servers, where forking a pool per
+    request would multiply processes. PDFs shorter than _PARALLEL_MIN_PAGES are
+    always extracted in-process.
+    stream_text_preview: include the latin-1 text view of the stream preview
+    (content_stream_preview_utf8); when False the field is left empty.
+    normalize_word_floats: coerce int word coordinates (x0/x1/top/bottom) to float.
+    Current pdfplumber already returns floats, so this is off by default.
+    backend: text/word extractor. "pymupdf" is much faster than pdfplumber
+    (pdfminer) and needs the PyMuPDF package; page_workers and
+    normalize_word_floats only apply to "pdfplumber".
+    words_layout: "records" writes "words" as a list of dicts (what the bank
+    parsers read); "columnar" writes one list per key (see words_to_columnar),
+    which is smaller and faster to encode. Use words_to_records() to read it back.
+    max_full_stream_bytes: with include_full_stream, a content stream longer than
+    this is truncated (with a warning) and content_stream_full_truncated is set,
+    so one huge stream can't blow up memory; None = no cap.
     """
+    # heavy PDF libs are imported on use (here and in the pdfplumber helpers)
+    # rather than at module load, so the CLI's --help and importers start fast
+    try:
+        import pikepdf  # type: ignore
+    except Exception:
+        pikepdf = None
+
     from src.utils.path_security import open_validated_path, sanitize_filename, validate_path_for_write
     pdf_path = Path(pdf_path)
     out_dir = Path(DATA_DIR) / "converted_jsons"
@@ -49,74 +230,107 @@ def dump_pdf_pages(
     validate_base_dir.mkdir(parents=True, exist_ok=True)
     validated_out = validate_path_for_write(out_path, validate_base_dir)
 
-    # 1) Plain text + word positions (pdfplumber)
-    with pdfplumber.open(str(pdf_path)) as pl:
-        words_per_page = []
-        texts = []
-        for p in pl.pages:
-            texts.append(p.extract_text() or "")
-            # geometry is critical for your downstream column banding
-            words = p.extract_words(
-                x_tolerance=2,
-                y_tolerance=2,
-                keep_blank_chars=False
-            )
-            # normalize floats for stability
-            for w in words:
-                for k in ("x0", "x1", "top", "bottom"):
-                    if k in w and isinstance(w[k], (int, float)):
-                        w[k] = float(w[k])
-            words_per_page.append(words)
-
-    # 2) Raw content streams (pikepdf). If pikepdf is unavailable, degrade gracefully.
-    with open_validated_path(validated_out, "w", encoding="utf-8") as out:
-        if pikepdf is not None:
-            with pikepdf.open(str(pdf_path)) as pdf:
-                for i, page in enumerate(pdf.pages):
-                    contents = page.get("/Contents", None)
-                    raw_bytes = b""
-                    if contents is not None:
-                        try:
-                            raw_bytes = page.contents.read_bytes()  # convenience accessor
-                        except Exception:
+    # Plain text + word positions (pdfplumber) and raw content streams (pikepdf)
+    # are produced in one page-ordered pass; each library opens the file once.
+    # If pikepdf is unavailable, degrade gracefully.
+    # Lines are written in batches of _JSONL_BATCH_PAGES pages through a large buffer.
+    if backend == "pymupdf":
+        extracted = _iter_text_and_words_pymupdf(pdf_path)
+    elif backend == "pdfplumber":
+        extracted = _iter_text_and_words(pdf_path, page_workers, normalize_word_floats)
+    else:
+        raise ValueError(f"Unknown text backend: {backend!r}")
+    if words_layout not in ("records", "columnar"):
+        raise ValueError(f"Unknown words layout: {words_layout!r}")
+    columnar = words_layout == "columnar"
+    # Pages go to a temp file next to the output, moved into place only on
+    # success: a failed or killed dump never leaves a partial JSONL behind that
+    # the batch scripts would then reuse as if it were complete.
+    tmp_out = validate_path_for_write(
+        validated_out.with_name(f".{validated_out.name}.{os.getpid()}.tmp"), validate_base_dir
+    )
+    try:
+        with open_validated_path(tmp_out, "wb", buffering=_JSONL_WRITE_BUFFER) as out:
+            batch: List[bytes] = []
+
+            def emit(record: dict) -> None:
+                batch.append(_dumps_line(record))
+                if len(batch) >= _JSONL_BATCH_PAGES:
+                    out.writelines(batch)
+                    batch.clear()
+
+            if pikepdf is not None:
+                with pikepdf.open(str(pdf_path)) as pdf:
+                    for i, (page, (text, page_words)) in enumerate(zip(pdf.pages, extracted)):
+                        contents = page.get("/Contents", None)
+                        raw_bytes = b""
+                        if contents is not None:
                             try:
-                                if isinstance(contents, pikepdf.Array):
-                                    raw_bytes = b"".join(obj.read_bytes() for obj in contents)
-                                else:
-                                    raw_bytes = contents.read_bytes()
+                                raw_bytes = page.contents.read_bytes()  # convenience accessor
                             except Exception:
-                                raw_bytes = b""
+                                try:
+                                    if isinstance(contents, pikepdf.Array):
+                                        raw_bytes = b"".join(obj.read_bytes() for obj in contents)
+                                    else:
+                                        raw_bytes = contents.read_bytes()
+                                except Exception:
+                                    raw_bytes = b""
+
+                        preview = memoryview(raw_bytes)[:stream_preview_len]  # no copy
+                        full_b64 = None
+                        full_truncated = False
+                        if include_full_stream and raw_bytes:
+                            full = memoryview(raw_bytes)
+                            if max_full_stream_bytes is not None and len(full) > max_full_stream_bytes:
+                                warnings.warn(
+                                    f"{pdf_path.name} page {i + 1}: content stream of {len(full)} bytes "
+                                    f"truncated to {max_full_stream_bytes} in content_stream_full_b64"
+                                )
+                                full = full[:max_full_stream_bytes]
+                                full_truncated = True
+                            full_b64 = base64.b64encode(full)
+                        record = {
+                            "page_num": i + 1,
+                            "rotate": int(page.get("/Rotate", 0) or 0),
+                            "media_box": [float(x) for x in page.get("/MediaBox", [])] if page.get("/MediaBox") else None,
+                            "procset": [str(x) for x in (page.Resources.get("/ProcSet", []) if page.Resources else [])] or None,
+                            "text": text,
+                            # list of dicts: text, x0, x1, top, bottom, etc. (or columns of them)
+                            "words": words_to_columnar(page_words) if columnar else page_words,
+                            "content_stream_preview_utf8": str(preview, "latin-1") if stream_text_preview else "",
+                            # a truncated full stream may be shorter than the preview
+                            "content_stream_preview_b64": _preview_b64(preview, None if full_truncated else full_b64),
+                            "content_stream_len": len(raw_bytes),
+                        }
+                        if full_b64 is not None:
+                            record["content_stream_full_b64"] = full_b64.decode("ascii")
+                            if full_truncated:
+                                record["content_stream_full_truncated"] = True
 
-                    preview = raw_bytes[:stream_preview_len]
+                        emit(record)
+            else:
+                for i, (text, page_words) in enumerate(extracted):
                     record = {
                         "page_num": i + 1,
-                        "rotate": int(page.get("/Rotate", 0) or 0),
-                        "media_box": [float(x) for x in page.get("/MediaBox", [])] if page.get("/MediaBox") else None,
-                        "procset": [str(x) for x in (page.Resources.get("/ProcSet", []) if page.Resources else [])] or None,
-                        "text": texts[i],
-                        "words": words_per_page[i],  # list of dicts: text, x0, x1, top, bottom, etc.
-                        "content_stream_preview_utf8": preview.decode("latin-1", errors="replace"),
-                        "content_stream_preview_b64": base64.b64encode(preview).decode("ascii"),
-                        "content_stream_len": len(raw_bytes),
+                        "rotate": 0,
+                        "media_box": None,
+                        "procset": None,
+                        "text": text,
+                        "words": words_to_columnar(page_words) if columnar else page_words,
+                        "content_stream_preview_utf8": "",
+                        "content_stream_preview_b64": "",
+                        "content_stream_len": 0,
                     }
-                    if include_full_stream and raw_bytes:
-                        record["content_stream_full_b64"] = base64.b64encode(raw_bytes).decode("ascii")
-
-                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
-        else:
-            for i, page_words in enumerate(words_per_page):
-                record = {
-                    "page_num": i + 1,
-                    "rotate": 0,
-                    "media_box": None,
-                    "procset": None,
-                    "text": texts[i],
-                    "words": page_words,
-                    "content_stream_preview_utf8": "",
-                    "content_stream_preview_b64": "",
-                    "content_stream_len": 0,
-                }
-                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    emit(record)
+
+            out.writelines(batch)
+        os.replace(tmp_out, validated_out)
+    except BaseException:
+        try:
+            os.unlink(tmp_out)
+        except OSError:
+            pass
+        raise
 
     return out_path
 
@@ -129,6 +343,12 @@ def parse_args() -> argparse.Namespace:
     ap.add_argument("-o", "--out", default=None, help="Output JSONL file (optional). Defaults to DATA_DIR/converted_jsons/<pdf_stem>_pages.jsonl")
     ap.add_argument("--stream-preview-len", type=int, default=4000, help="Bytes of stream preview to include per page")
     ap.add_argument("--include-full-stream", action="store_true", help="Include full content stream (base64) per page")
+    ap.add_argument("--no-stream-text-preview", dest="stream_text_preview", action="store_false", help="Leave content_stream_preview_utf8 empty (base64 preview only)")
+    ap.add_argument("--page-workers", type=int, default=None, help="Processes for per-page text extraction (default: CPU count, 1 = sequential)")
+    ap.add_argument("--normalize-word-floats", action="store_true", help="Coerce integer word coordinates to float")
+    ap.add_argument("--backend", choices=["pdfplumber", "pymupdf"], default="pdfplumber", help="Text/word extractor (pymupdf is faster, needs PyMuPDF)")
+    ap.add_argument("--words-layout", choices=["records", "columnar"], default="records", help="Write words as a list of dicts (default) or as one list per key")
+    ap.add_argument("--max-full-stream-bytes", type=int, default=DEFAULT_MAX_FULL_STREAM_BYTES, help="With --include-full-stream, truncate longer streams to this many bytes (0 = no limit)")
     return ap.parse_args()
 
 if __name__ == "__main__":
@@ -140,6 +360,12 @@ if __name__ == "__main__":
         out_path=out_path,
         stream_preview_len=args.stream_preview_len,
         include_full_stream=args.include_full_stream,
+        page_workers=args.page_workers,
+        stream_text_preview=args.stream_text_preview,
+        normalize_word_floats=args.normalize_word_floats,
+        backend=args.backend,
+        words_layout=args.words_layout,
+        max_full_stream_bytes=args.max_full_stream_bytes or None,
     )
     print(f"Written {written}")
 
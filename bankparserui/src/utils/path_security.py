@@ -1,23 +1,36 @@
 """
 Security utilities for path validation to prevent path traversal attacks.
 """
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 
+_RE_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"|?*\x00-\x1f]')
+
+
+@lru_cache(maxsize=256)
+def _resolved_abs_base_dir(base_dir: str) -> Path:
+    return Path(base_dir).resolve()
+
+
+def _resolved_base_dir(base_dir: Union[str, Path]) -> Path:
+    # Absolute base directories are trusted config (DATA_DIR, project root, ...)
+    # and fixed for the life of the process, so their realpath is resolved once.
+    # Relative ones depend on the cwd and are resolved every time, as is the path
+    # being validated: caching that would let a symlink swapped in later slip
+    # past the traversal check.
+    if Path(base_dir).is_absolute():
+        return _resolved_abs_base_dir(str(base_dir))
+    return Path(base_dir).resolve()
+
 
 def validate_path_for_write(path: Union[str, Path], base_dir: Union[str, Path, None] = None) -> Path:
     """Validate path for write - path may not exist yet. Ensures it stays within base_dir."""
     resolved = Path(path).resolve()
     if base_dir is not None:
-        base_resolved = Path(base_dir).resolve()
-        try:
-            if not resolved.is_relative_to(base_resolved):
-                raise ValueError(f"Path traversal detected: {path}")
-        except AttributeError:
-            try:
-                resolved.relative_to(base_resolved)
-            except ValueError:
-                raise ValueError(f"Path traversal detected: {path}")
+        if not resolved.is_relative_to(_resolved_base_dir(base_dir)):
+            raise ValueError(f"Path traversal detected: {path}")
     return resolved
 
 
@@ -43,20 +56,13 @@ def validate_path(path: Union[str, Path], base_dir: Union[str, Path, None] = Non
     
     # If base_dir is specified, ensure path is within it
     if base_dir is not None:
-        base_resolved = Path(base_dir).resolve()
-        try:
-            if not resolved_path.is_relative_to(base_resolved):
-                raise ValueError(f"Path traversal detected: {path} is not within {base_dir}")
-        except AttributeError:
-            # Python < 3.9 compatibility
-            try:
-                resolved_path.relative_to(base_resolved)
-            except ValueError:
-                raise ValueError(f"Path traversal detected: {path} is not within {base_dir}")
+        if not resolved_path.is_relative_to(_resolved_base_dir(base_dir)):
+            raise ValueError(f"Path traversal detected: {path} is not within {base_dir}")
     
     return resolved_path
 
 
+@lru_cache(maxsize=1024)
 def sanitize_filename(filename: str, max_length: int = 255) -> str:
     """
     Sanitize filename to prevent path traversal and injection attacks.
@@ -68,13 +74,11 @@ def sanitize_filename(filename: str, max_length: int = 255) -> str:
     Returns:
         Sanitized filename
     """
-    import re
-    
     # Remove path components
     filename = Path(filename).name
     
     # Remove dangerous characters
-    filename = re.sub(r'[<>:"|?*\x00-\x1f]', '', filename)
+    filename = _RE_UNSAFE_FILENAME_CHARS.sub('', filename)
     
     # Remove leading/trailing dots and spaces
     filename = filename.strip('. ')
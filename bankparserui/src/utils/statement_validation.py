@@ -8,7 +8,7 @@ from typing import Optional, List, Dict, Any, Tuple
 import pandas as pd
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BankValidationSchema:
     opening_col: str
     closing_col: str
@@ -50,17 +50,26 @@ def _to_float_ru_generic(val: Any) -> float:
 
 
 
+class _KeepNumericChars(dict):
+    """str.translate table keeping only 0-9 , . - ; built lazily per code point."""
+
+    def __missing__(self, code: int) -> Optional[int]:
+        keep = code if chr(code) in "0123456789,.-" else None
+        self[code] = keep
+        return keep
+
+
+_KEEP_NUMERIC = _KeepNumericChars()
+
+
 def _parse_number(val) -> float:
     if pd.isna(val):
         return 0.0
     if isinstance(val, (int, float)):
         return float(val)
 
-    s = str(val)
-    s = s.replace("\xa0", " ").replace("\u202f", " ")
-    s = s.replace(" ", "")
-    # выкидываем всё, что не цифра / точка / запятая / минус
-    s = re.sub(r"[^0-9,.\-]", "", s)
+    # выкидываем всё, что не цифра / точка / запятая / минус (пробелы, NBSP тоже)
+    s = str(val).translate(_KEEP_NUMERIC)
     s = s.replace(",", ".")
     try:
         return float(s)
@@ -69,6 +78,43 @@ def _parse_number(val) -> float:
         return 0.0
 
 
+_NON_NUMERIC_PATTERN = r"[^0-9,.\-]"
+
+
+def _is_number(val: Any) -> bool:
+    return isinstance(val, (int, float))
+
+
+def _series_as_float(values: pd.Series) -> pd.Series:
+    """
+    Vectorized _parse_number: one pandas string pass + pd.to_numeric instead of
+    a Python call per cell. Unparseable / missing values become 0.0.
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.astype(float).fillna(0.0)
+
+    text = (
+        values.astype("string")
+        .str.replace(_NON_NUMERIC_PATTERN, "", regex=True)
+        .str.replace(",", ".", regex=False)
+    )
+    out = pd.to_numeric(text, errors="coerce").astype(float)
+
+    # numbers stored in object columns are taken as-is (str(1e20) would be mangled)
+    is_num = values.map(_is_number).astype(bool)
+    if is_num.any():
+        out = out.mask(is_num, values.where(is_num).astype(float))
+    return out.fillna(0.0)
+
+
+def _first_row_as_floats(df: pd.DataFrame, cols: List[str]) -> Dict[str, float]:
+    """Parse several columns of the first row in a single vectorized call."""
+    if not cols:
+        return {}
+    row = df.iloc[0][cols]
+    return dict(zip(cols, _series_as_float(pd.Series(list(row), dtype=object)).tolist()))
+
+
 def _col_as_float(df: pd.DataFrame, col: str) -> float:
     val = df.iloc[0][col]
     return _parse_number(val)
@@ -204,16 +250,22 @@ def validate_statement_generic(
     flags: List[str] = []
     debug: Dict[str, Any] = {}
 
+    opening_col, closing_col = schema.opening_col, schema.closing_col
+    ct_col, dt_col = schema.credit_turnover_col, schema.debit_turnover_col
+    fc_col, fd_col = schema.footer_credit_col, schema.footer_debit_col
+
     # --- header ---
-    opening = _col_as_float(header_df, schema.opening_col)
-    closing_pdf = _col_as_float(header_df, schema.closing_col)
+    header_cols = [c for c in (opening_col, closing_col, ct_col, dt_col) if c is not None]
+    header_vals = _first_row_as_floats(header_df, header_cols)
+    opening = header_vals[opening_col]
+    closing_pdf = header_vals[closing_col]
 
     credit_turnover_pdf = None
     debit_turnover_pdf = None
-    if schema.credit_turnover_col is not None:
-        credit_turnover_pdf = _col_as_float(header_df, schema.credit_turnover_col)
-    if schema.debit_turnover_col is not None:
-        debit_turnover_pdf = _col_as_float(header_df, schema.debit_turnover_col)
+    if ct_col is not None:
+        credit_turnover_pdf = header_vals[ct_col]
+    if dt_col is not None:
+        debit_turnover_pdf = header_vals[dt_col]
 
 
 
@@ -233,12 +285,10 @@ def validate_statement_generic(
     closing_calc = opening + total_credit - total_debit
 
     # --- footer ---
-    footer_credit = None
-    footer_debit = None
-    if schema.footer_credit_col is not None:
-        footer_credit = _col_as_float(footer_df, schema.footer_credit_col)
-    if schema.footer_debit_col is not None:
-        footer_debit = _col_as_float(footer_df, schema.footer_debit_col)
+    footer_cols = [c for c in (fc_col, fd_col) if c is not None]
+    footer_vals = _first_row_as_floats(footer_df, footer_cols)
+    footer_credit = footer_vals[fc_col] if fc_col is not None else None
+    footer_debit = footer_vals[fd_col] if fd_col is not None else None
 
 
     # --- checks ---
@@ -13,10 +13,42 @@ import threading
 from typing import Any, Dict
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
 
 _LOCK = threading.Lock()
 _LOADED = False
 
+_ENV_KEYS = (
+    "VAULT_ADDR",
+    "VAULT_TOKEN",
+    "VAULT_KV_MOUNT",
+    "VAULT_CONFIG_PATH",
+    "VAULT_CONFIG_KEY",
+    "VAULT_TIMEOUT_SECONDS",
+    "VAULT_SKIP_VERIFY",
+    "VAULT_REQUIRED",
+    "VAULT_ENABLED",
+    "VAULT_OVERWRITE",
+)
+
+# One keep-alive session for Vault calls; transient gateway errors are retried.
+_SESSION = requests.Session()
+for _scheme in ("https://", "http://"):
+    _SESSION.mount(
+        _scheme,
+        HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504)),
+        ),
+    )
+
 
 def _to_bool(value: str | None, default: bool = False) -> bool:
     if value is None:
@@ -29,6 +61,7 @@ def _normalize_addr(addr: str) -> str:
 
 
 def _safe_set_env(data: Dict[str, Any], overwrite: bool) -> None:
+    to_set: Dict[str, str] = {}
     for key, value in data.items():
         if not isinstance(key, str) or not key:
             continue
@@ -36,30 +69,41 @@ def _safe_set_env(data: Dict[str, Any], overwrite: bool) -> None:
             continue
         if not overwrite and key in os.environ:
             continue
-        os.environ[key] = str(value)
+        to_set[key] = str(value)
+    os.environ.update(to_set)
+
+
+def _read_vault_env() -> Dict[str, str]:
+    """Snapshot the VAULT_* variables (missing ones as "") in one pass over os.environ."""
+    environ = os.environ
+    return {key: environ.get(key, "") for key in _ENV_KEYS}
 
 
-def _fetch_vault_payload() -> Dict[str, Any]:
-    addr = os.getenv("VAULT_ADDR", "").strip()
-    token = os.getenv("VAULT_TOKEN", "").strip()
-    mount = os.getenv("VAULT_KV_MOUNT", "").strip() or "secret"
-    path = os.getenv("VAULT_CONFIG_PATH", "").strip()
-    config_key = os.getenv("VAULT_CONFIG_KEY", "").strip()
-    timeout = float(os.getenv("VAULT_TIMEOUT_SECONDS", "10").strip())
-    skip_verify = _to_bool(os.getenv("VAULT_SKIP_VERIFY"), default=False)
+def _fetch_vault_payload(env: Dict[str, str] | None = None) -> Dict[str, Any]:
+    if env is None:
+        env = _read_vault_env()
+    addr = env["VAULT_ADDR"].strip()
+    token = env["VAULT_TOKEN"].strip()
+    mount = env["VAULT_KV_MOUNT"].strip() or "secret"
+    path = env["VAULT_CONFIG_PATH"].strip()
+    config_key = env["VAULT_CONFIG_KEY"].strip()
+    timeout = float(env["VAULT_TIMEOUT_SECONDS"].strip() or "10")
+    skip_verify = _to_bool(env["VAULT_SKIP_VERIFY"], default=False)
 
     if not addr or not token or not path:
         raise ValueError("VAULT_ADDR, VAULT_TOKEN, and VAULT_CONFIG_PATH must be set")
 
     url = f"{_normalize_addr(addr)}/v1/{mount}/data/{path.lstrip('/')}"
-    response = requests.get(
+    response = _SESSION.get(
         url,
         headers={"X-Vault-Token": token},
         timeout=timeout,
         verify=not skip_verify,
     )
     response.raise_for_status()
-    body = response.json()
+    # parse the body bytes directly (both parsers take UTF-8 bytes), read once
+    raw = response.content
+    body = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
     raw_data = body.get("data", {}).get("data")
     if not isinstance(raw_data, dict):
@@ -73,7 +117,7 @@ def _fetch_vault_payload() -> Dict[str, Any]:
         selected = raw_data
 
     if isinstance(selected, str):
-        selected = json.loads(selected)
+        selected = orjson.loads(selected) if orjson is not None else json.loads(selected)
 
     if not isinstance(selected, dict):
         raise ValueError("Vault config payload must be a JSON object (dict)")
@@ -99,18 +143,19 @@ def load_vault_config_once() -> None:
         if _LOADED:
             return
 
-        required = _to_bool(os.getenv("VAULT_REQUIRED"), default=False)
-        enabled = _to_bool(os.getenv("VAULT_ENABLED"), default=False)
-        has_minimum = bool(os.getenv("VAULT_ADDR") and os.getenv("VAULT_TOKEN") and os.getenv("VAULT_CONFIG_PATH"))
+        env = _read_vault_env()
+        required = _to_bool(env["VAULT_REQUIRED"], default=False)
+        enabled = _to_bool(env["VAULT_ENABLED"], default=False)
+        has_minimum = bool(env["VAULT_ADDR"] and env["VAULT_TOKEN"] and env["VAULT_CONFIG_PATH"])
 
         if not enabled and not has_minimum:
             _LOADED = True
             return
 
-        overwrite = _to_bool(os.getenv("VAULT_OVERWRITE"), default=False)
+        overwrite = _to_bool(env["VAULT_OVERWRITE"], default=False)
 
         try:
-            payload = _fetch_vault_payload()
+            payload = _fetch_vault_payload(env)
             _safe_set_env(payload, overwrite=overwrite)
         except Exception:
             if required:
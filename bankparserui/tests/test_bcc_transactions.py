@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Run from the project root (so that `src` is importable):
+    python -m pytest -q tests
+"""
+
+import pandas as pd
+
+from src.bcc import transactions as bcc_tx
+
+
+def _row(date: str, docno: str, credit: str) -> list:
+    return [docno, date, "KCJBKZKX", "KZ00000000000000000", "", "ТОО  Ромашка",
+            "", "", credit, "190", "АО Банк", "Оплата\nпо счёту"]
+
+
+def _fake_tables(rows):
+    header = list(bcc_tx.COLS)
+    return lambda pdf_path: [pd.DataFrame([header] + rows)]
+
+
+def test_footer_without_date_keeps_all_transactions(monkeypatch):
+    rows = [
+        _row("01.06.2024", "1", "100,00"),
+        _row("02.06.2024", "2", "200,00"),
+        _row("", "", "300,00"),  # «Жиынтығы / Итого» – без даты
+    ]
+    monkeypatch.setattr(bcc_tx, "_read_tables_pymupdf", _fake_tables(rows))
+
+    df = bcc_tx.parse_bcc_transactions_camelot("statement.pdf")
+
+    assert list(df["Күні / Дата"]) == ["01.06.2024", "02.06.2024"]
+    assert list(df.columns) == bcc_tx.COLS
+    assert df["Корреспондент / Корреспондент"].iloc[0] == "ТОО Ромашка"
+    assert df["Төлемнің мақсаты / Назначение платежа"].iloc[0] == "Оплата по счёту"
+
+
+def test_last_row_is_dropped_as_footer_and_empty_dates_filtered(monkeypatch):
+    rows = [
+        _row("01.06.2024", "1", "100,00"),
+        _row("  ", "", ""),  # пустая строка-перенос внутри таблицы
+        _row("02.06.2024", "2", "200,00"),
+        _row("03.06.2024", "", "300,00"),  # футер с заполненной ячейкой даты
+    ]
+    monkeypatch.setattr(bcc_tx, "_read_tables_pymupdf", _fake_tables(rows))
+
+    df = bcc_tx.parse_bcc_transactions_camelot("statement.pdf")
+
+    assert list(df["Күні / Дата"]) == ["01.06.2024", "02.06.2024"]